@@ -0,0 +1,219 @@
+"""Micro-batching of concurrent summarization requests."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+SummarizeOne = Callable[[str, str], Awaitable[str]]
+SummarizeMany = Callable[[List[str], str], Awaitable[List[str]]]
+CountTokens = Callable[[str], int]
+
+
+async def _collect_batch(
+    queue: asyncio.Queue,
+    loop: asyncio.AbstractEventLoop,
+    batch: List[Any],
+    max_batch_size: int,
+    batch_wait_timeout_s: float
+) -> None:
+    """Wait for one queued item, then gather more until the batch is full or time runs out.
+
+    Items are appended to batch as they arrive, so a caller that is cancelled
+    mid-collection still knows which items it took off the queue.
+    """
+    batch.append(await queue.get())
+    deadline = loop.time() + batch_wait_timeout_s
+
+    while len(batch) < max_batch_size:
+        if not queue.empty():
+            batch.append(queue.get_nowait())
+            continue
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), remaining))
+        except asyncio.TimeoutError:
+            break
+
+
+def _resolve(futures: List[asyncio.Future], results: List[Any]) -> None:
+    """Hand each waiting caller its result or exception."""
+    for future, result in zip(futures, results):
+        if future.done():
+            continue
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+def _fail(futures: List[asyncio.Future], error: BaseException) -> None:
+    """Hand every waiting caller the same exception."""
+    _resolve(futures, [error] * len(futures))
+
+
+class AsyncBatchSummarizer:
+    """Coalesce summary requests that arrive close together into one API call.
+
+    Batched transcripts share one prompt, so a transcript can influence the
+    summaries of the others in its batch; only enable batching when every
+    caller's content is trusted.
+    """
+
+    def __init__(
+        self,
+        summarize_one: SummarizeOne,
+        summarize_many: SummarizeMany,
+        max_batch_size: int = 8,
+        batch_wait_timeout_s: float = 0.05,
+        max_batch_tokens: Optional[int] = None,
+        count_tokens: Optional[CountTokens] = None
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            summarize_one: Coroutine summarizing a single transcript
+            summarize_many: Coroutine summarizing several transcripts in one call
+            max_batch_size: Maximum number of requests combined into one call
+            batch_wait_timeout_s: How long to wait for more requests to arrive
+                while earlier batches are still in flight
+            max_batch_tokens: Maximum transcript tokens combined into one call
+            count_tokens: Token counter used with max_batch_tokens
+        """
+        self.summarize_one = summarize_one
+        self.summarize_many = summarize_many
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self.max_batch_tokens = max_batch_tokens
+        self.count_tokens = count_tokens
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def submit(self, transcript: str, summary_type: str) -> str:
+        """
+        Queue a transcript for summarization and wait for its result.
+
+        Args:
+            transcript: The transcript text to summarize
+            summary_type: Type of summary requested
+
+        Returns:
+            Generated summary text
+        """
+        if self.max_batch_size == 1:
+            return await self.summarize_one(transcript, summary_type)
+
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((transcript, summary_type, future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        """Start the background consumer on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the worker; requests still queued or in flight fail with RuntimeError."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        tasks = [task for task in (self._worker, *self._in_flight) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker = None
+
+        while self._queue is not None and not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            _fail([future], RuntimeError("Summary batcher closed"))
+
+    async def _run(self) -> None:
+        """Consume the queue until closed, dispatching each batch without waiting for it."""
+        batch: List[Tuple[str, str, asyncio.Future]] = []
+        try:
+            while True:
+                batch = []
+                # When idle, send whatever is queued right away so a lone request
+                # doesn't wait; only hold requests back while calls are in flight
+                wait_s = self.batch_wait_timeout_s if self._in_flight else 0.0
+                await _collect_batch(
+                    self._queue, self._loop, batch, self.max_batch_size, wait_s
+                )
+                try:
+                    self._start_dispatches(batch)
+                except Exception as e:
+                    # Fail this batch's callers rather than the worker
+                    _fail([future for *_, future in batch], e)
+        finally:
+            # Requests collected but not yet dispatched when the worker stops
+            _fail([future for *_, future in batch], RuntimeError("Summary batcher closed"))
+
+    def _start_dispatches(self, batch: List[Tuple[str, str, asyncio.Future]]) -> None:
+        """Start one call per summary type and token budget within a batch."""
+        # Only requests for the same summary type share a prompt
+        groups: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        for transcript, summary_type, future in batch:
+            groups.setdefault(summary_type, []).append((transcript, future))
+
+        for summary_type, items in groups.items():
+            for chunk in self._split_by_tokens(items):
+                task = self._loop.create_task(self._dispatch(summary_type, chunk))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+    def _split_by_tokens(
+        self,
+        items: List[Tuple[str, asyncio.Future]]
+    ) -> List[List[Tuple[str, asyncio.Future]]]:
+        """Split a group so no call carries more than max_batch_tokens of transcript."""
+        if self.max_batch_tokens is None or self.count_tokens is None:
+            return [items]
+
+        batches: List[List[Tuple[str, asyncio.Future]]] = []
+        current: List[Tuple[str, asyncio.Future]] = []
+        used = 0
+        for item in items:
+            tokens = self.count_tokens(item[0])
+            if current and used + tokens > self.max_batch_tokens:
+                batches.append(current)
+                current, used = [], 0
+            current.append(item)
+            used += tokens
+        batches.append(current)
+        return batches
+
+    async def _dispatch(
+        self,
+        summary_type: str,
+        items: List[Tuple[str, asyncio.Future]]
+    ) -> None:
+        """Summarize one group and resolve the waiting futures."""
+        transcripts = [transcript for transcript, _ in items]
+        futures = [future for _, future in items]
+
+        results: List[object] = []
+        try:
+            if len(items) > 1:
+                try:
+                    results = list(await self.summarize_many(transcripts, summary_type))
+                except Exception:
+                    results = []
+
+            if len(results) != len(items):
+                # Batched call failed or returned a malformed list; go one by one
+                results = await asyncio.gather(
+                    *(self.summarize_one(t, summary_type) for t in transcripts),
+                    return_exceptions=True
+                )
+        except asyncio.CancelledError:
+            _fail(futures, RuntimeError("Summary batcher closed"))
+            raise
+
+        _resolve(futures, results)
+
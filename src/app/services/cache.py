@@ -0,0 +1,283 @@
+"""Response caching for the AI services."""
+
+import gzip
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - semantic matching is optional
+    np = None
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is optional
+    aioredis = None
+
+# One embedding vector, or one per window of a long text
+Embedding = Union[List[float], List[List[float]]]
+
+
+class SummaryCache:
+    """Exact-match cache with an optional embedding similarity tier."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        max_entries: int = 256,
+        ttl_seconds: int = 3600,
+        similarity_threshold: float = 0.95
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL; an in-process LRU is used when unset
+            max_entries: Maximum entries kept in the in-process tiers
+            ttl_seconds: Time to live for cached values
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._redis = None
+        if redis_url and aioredis is not None:
+            self._redis = aioredis.from_url(redis_url)
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._vectors: Dict[str, "OrderedDict[str, Tuple[Any, Any]]"] = {}
+
+    @classmethod
+    def from_env(cls) -> "SummaryCache":
+        """Build a cache configured from environment variables."""
+        return cls(
+            redis_url=os.getenv("REDIS_URL"),
+            max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "256")),
+            ttl_seconds=int(os.getenv("SUMMARY_CACHE_TTL_S", "3600")),
+            similarity_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        )
+
+    @property
+    def semantic_available(self) -> bool:
+        """Whether embedding similarity lookups are supported."""
+        return np is not None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value by exact key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(key)
+            except Exception:
+                raw = None
+            return json.loads(raw) if raw is not None else None
+
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a JSON-serializable value under an exact key.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, json.dumps(value), ex=self.ttl_seconds)
+            except Exception:
+                pass
+            return
+
+        self._local[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def find_similar(self, namespace: str, embedding: Embedding) -> Optional[Any]:
+        """
+        Find the cached value whose embedding is closest to the given one.
+
+        Args:
+            namespace: Partition of the index (e.g. model and prompt kind)
+            embedding: Embedding of the transcript being looked up, or one
+                embedding per window of a long transcript
+
+        Returns:
+            Cached value if the best cosine similarity clears the threshold;
+            for windowed embeddings every window has to clear it
+        """
+        entries = self._vectors.get(namespace)
+        if not entries or np is None:
+            return None
+
+        query = self._normalize(embedding)
+        keys = list(entries)
+        matrix = np.stack([entries[key][0] for key in keys])
+        if matrix.shape[1:] != query.shape:
+            return None
+        # Cosine per window, scored by the least similar window
+        scores = (matrix * query).sum(axis=-1).reshape(len(keys), -1).min(axis=1)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        entries.move_to_end(keys[best])
+        return entries[keys[best]][1]
+
+    def add_embedding(
+        self,
+        namespace: str,
+        key: str,
+        embedding: Embedding,
+        value: Any
+    ) -> None:
+        """
+        Index a value by its transcript embedding.
+
+        Args:
+            namespace: Partition of the index (e.g. model and prompt kind)
+            key: Exact cache key of the value
+            embedding: Embedding of the transcript, or one per window
+            value: Value to return on a similar lookup
+        """
+        if np is None:
+            return
+
+        entries = self._vectors.setdefault(namespace, OrderedDict())
+        entries[key] = (self._normalize(embedding), value)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def _normalize(self, embedding: Embedding) -> Any:
+        """Convert an embedding, or each window's embedding, to unit-length float32."""
+        vectors = np.asarray(embedding, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+class ResultCache:
+    """Cache of pipeline results keyed by video content hash.
+
+    Hot entries live in an in-process LRU; when Redis is configured it backs
+    the LRU with gzip-compressed values shared between workers.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        max_entries: int = 128,
+        ttl_seconds: int = 3600
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL; only the in-process LRU is used when unset
+            max_entries: Maximum entries kept in the in-process LRU
+            ttl_seconds: Time to live for cached values
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._redis = None
+        if redis_url and aioredis is not None:
+            self._redis = aioredis.from_url(redis_url)
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """Build a cache configured from environment variables."""
+        return cls(
+            redis_url=os.getenv("REDIS_URL"),
+            max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "128")),
+            ttl_seconds=int(os.getenv("RESULT_CACHE_TTL_S", "3600"))
+        )
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached result, checking the local LRU before Redis.
+
+        Args:
+            key: Cache key, e.g. "transcript:<hash>"
+
+        Returns:
+            Cached text, or None on a miss
+        """
+        entry = self._local.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at >= time.monotonic():
+                self._local.move_to_end(key)
+                return value
+            del self._local[key]
+
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(key)
+        except Exception:
+            return None
+        if raw is None:
+            return None
+
+        value = gzip.decompress(raw).decode("utf-8")
+        self._remember(key, value)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """
+        Store a result locally and, when configured, in Redis.
+
+        Args:
+            key: Cache key, e.g. "transcript:<hash>"
+            value: Text to store
+        """
+        self._remember(key, value)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                key, gzip.compress(value.encode("utf-8")), ex=self.ttl_seconds
+            )
+        except Exception:
+            pass
+
+    async def delete(self, key: str) -> None:
+        """
+        Remove a result locally and, when configured, from Redis.
+
+        Args:
+            key: Cache key, e.g. "summary_error:<hash>"
+        """
+        self._local.pop(key, None)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(key)
+        except Exception:
+            pass
+
+    def _remember(self, key: str, value: str) -> None:
+        """Insert into the local LRU, evicting the least recently used entries."""
+        self._local[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
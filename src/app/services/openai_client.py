@@ -0,0 +1,78 @@
+"""Shared OpenAI client construction for the service layer."""
+
+import importlib.util
+import os
+import ssl
+from typing import Optional
+
+import httpx
+from openai import DEFAULT_TIMEOUT, AsyncOpenAI
+
+# Connection pool sizing of the shared HTTP client
+MAX_KEEPALIVE_CONNECTIONS = 100
+MAX_CONNECTIONS = 200
+
+_ssl_context: Optional[ssl.SSLContext] = None
+_async_client_singleton: Optional[AsyncOpenAI] = None
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    """Build the default SSL context once; loading CA certificates hits the disk."""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def _get_limits() -> httpx.Limits:
+    """Connection limits that keep TLS sessions alive between API calls."""
+    return httpx.Limits(
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        max_connections=MAX_CONNECTIONS,
+    )
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (installed by httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _get_api_key(api_key: Optional[str]) -> str:
+    """Resolve the API key from the argument or the environment."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable is required")
+    return api_key
+
+
+def get_async_openai_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Get the process-wide asynchronous OpenAI client.
+
+    Args:
+        api_key: API key to use when the client is first created
+
+    Returns:
+        Shared AsyncOpenAI client backed by a pooled httpx.AsyncClient
+    """
+    global _async_client_singleton
+    if _async_client_singleton is None:
+        http_client = httpx.AsyncClient(
+            verify=_get_ssl_context(),
+            limits=_get_limits(),
+            timeout=DEFAULT_TIMEOUT,
+            http2=_http2_available(),
+        )
+        _async_client_singleton = AsyncOpenAI(
+            api_key=_get_api_key(api_key),
+            http_client=http_client,
+        )
+    return _async_client_singleton
+
+
+async def close_async_openai_client() -> None:
+    """Close the process-wide asynchronous client and its connection pool."""
+    global _async_client_singleton
+    if _async_client_singleton is not None:
+        client, _async_client_singleton = _async_client_singleton, None
+        await client.close()
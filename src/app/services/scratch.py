@@ -0,0 +1,89 @@
+"""Pool of preallocated scratch directories for per-request working files."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List
+
+
+def _clear_directory(path: Path) -> None:
+    """Remove everything inside a directory, keeping the directory itself."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+
+
+class ScratchPool:
+    """Fixed set of scratch directories leased to one request at a time.
+
+    The directories are created once and emptied when returned, so requests
+    don't create and remove a temporary directory each. Leasing waits while
+    every slot is in use, which also caps videos processed at once per process.
+    """
+
+    def __init__(self, root: Path, size: int = 4):
+        """
+        Create the slot directories.
+
+        Args:
+            root: Directory the slots are created in; removed again by close()
+            size: Number of slots, i.e. requests that can hold one at once
+        """
+        self.root = Path(root)
+        self.size = max(1, size)
+        self.slots: List[Path] = []
+        self._queue: asyncio.Queue = asyncio.Queue()
+        for index in range(self.size):
+            slot = self.root / f"slot_{index}"
+            slot.mkdir(parents=True, exist_ok=True)
+            _clear_directory(slot)
+            self.slots.append(slot)
+            self._queue.put_nowait(slot)
+
+    @classmethod
+    def from_env(cls, slot_bytes: int = 0) -> "ScratchPool":
+        """
+        Build a pool configured from environment variables.
+
+        Slots go under SCRATCH_DIR, or by default in the system temp dir where
+        uploads are spooled (TMPDIR), so a spooled upload can be copied into a
+        slot inside the kernel. Set TMPDIR to a tmpfs to keep both in memory.
+
+        Args:
+            slot_bytes: Space one request may need; SCRATCH_SLOTS is lowered
+                to the number of slots that fit in the free space
+        """
+        base = os.getenv("SCRATCH_DIR") or tempfile.gettempdir()
+        os.makedirs(base, exist_ok=True)
+        size = int(os.getenv("SCRATCH_SLOTS", "4"))
+        if slot_bytes > 0:
+            size = min(size, max(1, shutil.disk_usage(base).free // slot_bytes))
+        root = tempfile.mkdtemp(prefix="videoextractor-", dir=base)
+        return cls(Path(root), size=size)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Path]:
+        """
+        Borrow an empty slot for the duration of a request.
+
+        Yields:
+            Path of the slot directory; its contents are removed on exit
+        """
+        slot = await self._queue.get()
+        try:
+            yield slot
+        finally:
+            try:
+                await asyncio.to_thread(_clear_directory, slot)
+            finally:
+                self._queue.put_nowait(slot)
+
+    def close(self) -> None:
+        """Remove the slot directories and their root."""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -1,22 +1,144 @@
 """AI summarization service using OpenAI GPT models."""
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional, List
-from openai import OpenAI
+import re
+import tempfile
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Final, Optional, List
+
+from openai import AsyncOpenAI
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - falls back to character chunking
+    tiktoken = None
+
+from .batching import AsyncBatchSummarizer
+from .cache import SummaryCache
+from .openai_client import get_async_openai_client
+
+# Prompts are module constants so every request sends byte-identical system
+# messages and prompt prefixes, which lets OpenAI's prompt cache hit
+SYSTEM_SUMMARY: Final[str] = (
+    "You are an expert at creating clear, concise summaries of video content based on transcripts."
+)
+SYSTEM_KP: Final[str] = (
+    "You are an expert at identifying and extracting key information from video transcripts."
+)
+SYSTEM_AI: Final[str] = (
+    "You are an expert at identifying actionable tasks and next steps from video content."
+)
+
+PROMPT_SUMMARY_HEAD: Final[str] = "Please summarize the following video transcript:\n\n"
+PROMPT_BRIEF_TAIL: Final[str] = "Provide a brief, 2-3 sentence summary of the main points."
+PROMPT_KEY_POINTS_TAIL: Final[str] = "Extract and list the key points discussed in the video."
+PROMPT_COMP_TAIL: Final[str] = (
+    "Provide a comprehensive summary that covers:\n"
+    "1. Main topic/purpose of the video\n"
+    "2. Key points and important details\n"
+    "3. Conclusions or outcomes\n"
+    "4. Any action items or next steps mentioned"
+)
+
+PROMPT_KP_TEMPLATE: Final[str] = """\
+Extract the most important key points from this video transcript.
+Return them as a JSON object of the form {{"items": ["...", "..."]}}, with each point being concise but informative.
+Focus on main topics, important decisions, conclusions, and actionable items.
+
+Transcript:
+{transcript}
+
+Key Points:
+"""
+
+PROMPT_AI_TEMPLATE: Final[str] = """\
+Identify any action items, tasks, or next steps mentioned in this video transcript.
+Return them as a JSON object of the form {{"items": ["...", "..."]}}. If no specific action items are mentioned,
+suggest relevant follow-up actions based on the content.
+
+Transcript:
+{transcript}
+
+Action Items:
+"""
+
+# Long transcripts are embedded in windows that fit the embedding model context
+EMBEDDING_MAX_CHARS = 24000
+
+# Numbered or bulleted list line, used when a reply is not valid JSON
+LIST_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|[-•])\s*(.+?)\s*$", re.M)
+
+# Batch API statuses after which a batch no longer changes
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Rough token size used to chunk transcripts when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+# Reply budget of one summary; a batched call needs the full budget for
+# every summary it carries
+SUMMARY_MAX_TOKENS = 1500
+
+# Most tokens one completion can return, by model name prefix (first match wins)
+MODEL_COMPLETION_MAX_TOKENS: Final = (
+    ("gpt-4.1", 32768),
+    ("gpt-4o", 16384),
+    ("gpt-4-turbo", 4096),
+    ("gpt-3.5-turbo", 4096),
+)
+DEFAULT_COMPLETION_MAX_TOKENS = 4096
 
 
 class SummarizationService:
     """Service for generating summaries using OpenAI GPT models."""
 
-    def __init__(self):
-        """Initialize the summarization service."""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY environment variable is required for summarization"
-            )
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        """
+        Initialize the summarization service.
+
+        Args:
+            client: Shared OpenAI client; the process-wide client is used when omitted
+        """
+        if client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError(
+                    "OPENAI_API_KEY environment variable is required for summarization"
+                )
+            client = get_async_openai_client(api_key)
+        self.client = client
         self.model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+        # Batching puts different callers' transcripts in one prompt, so it is
+        # off unless enabled with SUMMARY_MAX_BATCH_SIZE
+        self._batcher = AsyncBatchSummarizer(
+            self._summarize_single,
+            self._summarize_batch,
+            max_batch_size=min(
+                int(os.getenv("SUMMARY_MAX_BATCH_SIZE", "1")),
+                self._completion_max_tokens() // SUMMARY_MAX_TOKENS
+            ),
+            batch_wait_timeout_s=float(os.getenv("SUMMARY_BATCH_WAIT_S", "0.05")),
+            max_batch_tokens=int(os.getenv("SUMMARY_BATCH_MAX_TOKENS", "8000")),
+            count_tokens=self._count_tokens
+        )
+        self.cache = SummaryCache.from_env()
+        self.embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+        self.semantic_cache_enabled = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+        self._embedding_tasks: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self.chunk_tokens = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+        self.chunk_overlap_tokens = int(os.getenv("SUMMARY_CHUNK_OVERLAP_TOKENS", "200"))
+        self._encoding: Optional[Any] = None
+        self._encoding_loaded = False
+
+    async def warm_up(self) -> None:
+        """Load the tokenizer used for chunking before the first request needs it."""
+        await asyncio.to_thread(self._get_encoding)
+
+    async def close(self) -> None:
+        """Stop the request batcher, failing summaries still waiting on it."""
+        await self._batcher.close()
 
     async def generate_summary(
         self, 
@@ -36,30 +158,201 @@ class SummarizationService:
         if not transcript.strip():
             return "No transcript content to summarize."
 
-        prompt = self._get_summary_prompt(transcript, summary_type)
-        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at creating clear, concise summaries of video content based on transcripts."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=1500,
-                temperature=0.3
+            return await self._cached(
+                f"summary:{summary_type}",
+                transcript,
+                lambda: self._summarize(transcript, summary_type)
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             raise RuntimeError(f"Summary generation failed: {str(e)}")
 
+    async def _summarize(self, transcript: str, summary_type: str) -> str:
+        """Summarize short transcripts directly and long ones by map-reduce."""
+        chunks = self._chunk_transcript(transcript)
+        if len(chunks) == 1:
+            return await self._batcher.submit(transcript, summary_type)
+
+        # Map: summarize every chunk in parallel
+        chunk_summaries = await asyncio.gather(*(
+            self._summarize_chunk(chunk, index, len(chunks))
+            for index, chunk in enumerate(chunks, start=1)
+        ))
+
+        # Reduce: one final summary over the partial summaries
+        combined = "\n\n".join(
+            f"Part {index}:\n{summary}"
+            for index, summary in enumerate(chunk_summaries, start=1)
+        )
+        prompt = (
+            "The following are summaries of consecutive parts of one video transcript:"
+            f"\n\n{combined}\n\n"
+            "Combine them into a single summary of the whole video. "
+            f"{self._get_summary_instructions(summary_type)}"
+        )
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_SUMMARY
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            max_tokens=SUMMARY_MAX_TOKENS,
+            temperature=0.3
+        )
+        
+        return response.choices[0].message.content.strip()
+
+    async def _summarize_chunk(self, chunk: str, index: int, total: int) -> str:
+        """Summarize one part of a long transcript for the map step."""
+        prompt = (
+            f"Please summarize part {index} of {total} of a video transcript:\n\n{chunk}\n\n"
+            "Keep the main topics, important details, conclusions and any action items."
+        )
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_SUMMARY
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            max_tokens=500,
+            temperature=0.3
+        )
+        
+        return response.choices[0].message.content.strip()
+
+    def _chunk_transcript(self, transcript: str) -> List[str]:
+        """Split a transcript into overlapping chunks of about chunk_tokens tokens."""
+        tokens = self.chunk_tokens
+        overlap = min(self.chunk_overlap_tokens, tokens // 2)
+        encoding = self._get_encoding()
+
+        if encoding is None:
+            # Without tiktoken, approximate tokens as characters
+            tokens *= CHARS_PER_TOKEN
+            overlap *= CHARS_PER_TOKEN
+            units: Any = transcript
+        else:
+            units = encoding.encode(transcript, disallowed_special=())
+
+        if len(units) <= tokens:
+            return [transcript]
+
+        chunks = []
+        step = tokens - overlap
+        for start in range(0, len(units), step):
+            window = units[start:start + tokens]
+            chunks.append(window if encoding is None else encoding.decode(window))
+            if start + tokens >= len(units):
+                break
+        return chunks
+
+    def _completion_max_tokens(self) -> int:
+        """Most tokens one completion of the configured model can return."""
+        configured = os.getenv("SUMMARY_COMPLETION_MAX_TOKENS")
+        if configured:
+            return int(configured)
+        for prefix, max_tokens in MODEL_COMPLETION_MAX_TOKENS:
+            if self.model.startswith(prefix):
+                return max_tokens
+        return DEFAULT_COMPLETION_MAX_TOKENS
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens with tiktoken, or estimate them from the length."""
+        encoding = self._get_encoding()
+        if encoding is None:
+            return len(text) // CHARS_PER_TOKEN
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def _get_encoding(self) -> Optional[Any]:
+        """Get the tokenizer for the configured model, if tiktoken can load one."""
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            if tiktoken is not None:
+                try:
+                    try:
+                        self._encoding = tiktoken.encoding_for_model(self.model)
+                    except KeyError:
+                        self._encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    # Encodings are downloaded on first use and may be unreachable
+                    self._encoding = None
+        return self._encoding
+
+    async def _summarize_single(self, transcript: str, summary_type: str) -> str:
+        """Summarize one transcript with a dedicated chat completion."""
+        prompt = self._get_summary_prompt(transcript, summary_type)
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_SUMMARY
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            max_tokens=SUMMARY_MAX_TOKENS,
+            temperature=0.3
+        )
+        
+        return response.choices[0].message.content.strip()
+
+    async def _summarize_batch(
+        self, 
+        transcripts: List[str], 
+        summary_type: str
+    ) -> List[str]:
+        """Summarize several transcripts with a single chat completion."""
+        numbered = "\n\n".join(
+            f"Transcript {i}:\n{transcript}"
+            for i, transcript in enumerate(transcripts, start=1)
+        )
+        prompt = (
+            f"Please summarize each of the following {len(transcripts)} video transcripts "
+            f"independently.\n\n{numbered}\n\n"
+            f"{self._get_summary_instructions(summary_type)}\n\n"
+            'Return a JSON object of the form {"summaries": ["...", "..."]} with exactly '
+            f"{len(transcripts)} summaries, in the same order as the transcripts."
+        )
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_SUMMARY
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            max_tokens=SUMMARY_MAX_TOKENS * len(transcripts),
+            temperature=0.3,
+            response_format={"type": "json_object"}
+        )
+        
+        summaries = json.loads(response.choices[0].message.content)["summaries"]
+        return [str(summary).strip() for summary in summaries]
+
     async def generate_key_points(self, transcript: str) -> List[str]:
         """
         Extract key points from the transcript.
@@ -73,51 +366,38 @@ class SummarizationService:
         if not transcript.strip():
             return ["No transcript content to analyze."]
 
-        prompt = f"""
-        Extract the most important key points from this video transcript. 
-        Return them as a numbered list, with each point being concise but informative.
-        Focus on main topics, important decisions, conclusions, and actionable items.
-
-        Transcript:
-        {transcript}
-
-        Key Points:
-        """
-        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at identifying and extracting key information from video transcripts."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=800,
-                temperature=0.2
+            return await self._cached(
+                "key_points", transcript, lambda: self._extract_key_points(transcript)
             )
             
-            content = response.choices[0].message.content.strip()
-            
-            # Parse the response into a list
-            key_points = []
-            for line in content.split('\n'):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                    # Remove numbering/bullets and add to list
-                    cleaned_point = line.lstrip('0123456789.-• ').strip()
-                    if cleaned_point:
-                        key_points.append(cleaned_point)
-            
-            return key_points if key_points else [content]
-            
         except Exception as e:
             raise RuntimeError(f"Key points extraction failed: {str(e)}")
 
+    async def _extract_key_points(self, transcript: str) -> List[str]:
+        """Ask the model for key points and parse them into a list."""
+        source = await self._get_cached_summary(transcript) or transcript
+        prompt = PROMPT_KP_TEMPLATE.format(transcript=source)
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_KP
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            max_tokens=800,
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
+        
+        return self._parse_list(response.choices[0].message.content.strip())
+
     async def generate_action_items(self, transcript: str) -> List[str]:
         """
         Extract action items and tasks from the transcript.
@@ -131,64 +411,269 @@ class SummarizationService:
         if not transcript.strip():
             return ["No transcript content to analyze."]
 
-        prompt = f"""
-        Identify any action items, tasks, or next steps mentioned in this video transcript.
-        Return them as a clear list. If no specific action items are mentioned, 
-        suggest relevant follow-up actions based on the content.
+        try:
+            return await self._cached(
+                "action_items", transcript, lambda: self._extract_action_items(transcript)
+            )
+            
+        except Exception as e:
+            raise RuntimeError(f"Action items extraction failed: {str(e)}")
+
+    async def _extract_action_items(self, transcript: str) -> List[str]:
+        """Ask the model for action items and parse them into a list."""
+        source = await self._get_cached_summary(transcript) or transcript
+        prompt = PROMPT_AI_TEMPLATE.format(transcript=source)
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_AI
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            max_tokens=600,
+            temperature=0.2,
+            response_format={"type": "json_object"}
+        )
+        
+        return self._parse_list(response.choices[0].message.content.strip())
+
+    def _parse_list(self, content: str) -> List[str]:
+        """Parse a JSON {"items": [...]} reply, falling back to a bulleted list."""
+        try:
+            items = json.loads(content)["items"]
+            parsed = [str(item).strip() for item in items if str(item).strip()]
+        except (ValueError, KeyError, TypeError):
+            parsed = LIST_ITEM_RE.findall(content)
+        
+        return parsed if parsed else [content]
 
-        Transcript:
-        {transcript}
+    async def generate_full_report(self, transcript: str) -> Dict[str, Any]:
+        """
+        Generate summary, key points and action items concurrently.
+        
+        Args:
+            transcript: The transcript text to analyze
+            
+        Returns:
+            Dictionary with 'summary', 'key_points' and 'action_items'
+        """
+        summary, key_points, action_items = await asyncio.gather(
+            self.generate_summary(transcript),
+            self.generate_key_points(transcript),
+            self.generate_action_items(transcript)
+        )
+        
+        return {
+            "summary": summary,
+            "key_points": key_points,
+            "action_items": action_items
+        }
 
-        Action Items:
+    async def submit_batch(
+        self, 
+        transcripts: Dict[str, str], 
+        summary_type: str = "comprehensive"
+    ) -> Dict[str, Any]:
         """
+        Submit transcripts to the OpenAI Batch API for offline summarization.
         
+        Batch jobs complete within 24 hours at a reduced price and do not count
+        against the synchronous rate limits.
+        
+        Args:
+            transcripts: Mapping of caller-chosen IDs (e.g. video IDs) to transcripts
+            summary_type: Type of summary ('brief', 'comprehensive', 'key_points')
+            
+        Returns:
+            Dictionary with the created batch's 'id' and 'status'
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at identifying actionable tasks and next steps from video content."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
+            with tempfile.TemporaryFile("w+b") as batch_file:
+                for custom_id, transcript in transcripts.items():
+                    request = {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": self.model,
+                            "messages": [
+                                {
+                                    "role": "system",
+                                    "content": SYSTEM_SUMMARY
+                                },
+                                {
+                                    "role": "user",
+                                    "content": self._get_summary_prompt(transcript, summary_type)
+                                }
+                            ],
+                            "max_tokens": SUMMARY_MAX_TOKENS,
+                            "temperature": 0.3
+                        }
                     }
-                ],
-                max_tokens=600,
-                temperature=0.2
+                    batch_file.write(json.dumps(request).encode() + b"\n")
+                batch_file.seek(0)
+
+                uploaded = await self.client.files.create(
+                    file=("summaries.jsonl", batch_file),
+                    purpose="batch"
+                )
+
+            batch = await self.client.batches.create(
+                input_file_id=uploaded.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
             )
+            return {"id": batch.id, "status": batch.status}
             
-            content = response.choices[0].message.content.strip()
+        except Exception as e:
+            raise RuntimeError(f"Batch submission failed: {str(e)}")
+
+    async def get_batch_results(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a summarization batch and its results once completed.
+        
+        Args:
+            batch_id: ID of a batch created by submit_batch
+            
+        Returns:
+            Dictionary with 'id', 'status', 'summaries' and 'errors'
+        """
+        try:
+            batch = await self.client.batches.retrieve(batch_id)
+            result: Dict[str, Any] = {
+                "id": batch.id,
+                "status": batch.status,
+                "summaries": {},
+                "errors": {}
+            }
+            
+            if batch.status != "completed":
+                return result
             
-            # Parse the response into a list
-            action_items = []
-            for line in content.split('\n'):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                    # Remove numbering/bullets and add to list
-                    cleaned_item = line.lstrip('0123456789.-• ').strip()
-                    if cleaned_item:
-                        action_items.append(cleaned_item)
+            # Successful requests land in the output file, failed ones in the
+            # error file; either may be missing when every request went one way
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                content = await self.client.files.content(file_id)
+                for line in content.text.splitlines():
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    response = item.get("response") or {}
+                    if item.get("error") or response.get("status_code") != 200:
+                        result["errors"][item["custom_id"]] = item.get("error") or response.get("body")
+                        continue
+                    message = response["body"]["choices"][0]["message"]["content"]
+                    result["summaries"][item["custom_id"]] = message.strip()
             
-            return action_items if action_items else [content]
+            return result
             
         except Exception as e:
-            raise RuntimeError(f"Action items extraction failed: {str(e)}")
+            raise RuntimeError(f"Batch retrieval failed: {str(e)}")
+
+    async def wait_for_batch(
+        self, 
+        batch_id: str, 
+        poll_interval_s: float = 60.0
+    ) -> Dict[str, Any]:
+        """
+        Poll a summarization batch until it reaches a terminal status.
+        
+        Args:
+            batch_id: ID of a batch created by submit_batch
+            poll_interval_s: Seconds to wait between status checks
+            
+        Returns:
+            Final result from get_batch_results
+        """
+        while True:
+            result = await self.get_batch_results(batch_id)
+            if result["status"] in BATCH_TERMINAL_STATUSES:
+                return result
+            await asyncio.sleep(poll_interval_s)
+
+    async def _cached(
+        self, 
+        kind: str, 
+        transcript: str, 
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return a cached result for the transcript, computing it on a miss."""
+        key = self._cache_key(kind, transcript)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = None
+        if self.semantic_cache_enabled and self.cache.semantic_available:
+            embedding = await self._get_embedding(transcript)
+        # Only transcripts with the same number of windows are compared
+        namespace = f"{self.model}|{kind}|{len(embedding or [])}"
+        if embedding is not None:
+            similar = self.cache.find_similar(namespace, embedding)
+            if similar is not None:
+                return similar
+
+        result = await compute()
+        await self.cache.set(key, result)
+        if embedding is not None:
+            self.cache.add_embedding(namespace, key, embedding, result)
+        return result
+
+    async def _get_cached_summary(self, transcript: str) -> Optional[str]:
+        """Get a previously generated comprehensive summary, if any."""
+        return await self.cache.get(self._cache_key("summary:comprehensive", transcript))
+
+    def _cache_key(self, kind: str, transcript: str) -> str:
+        """Build the exact-match cache key for a transcript."""
+        return hashlib.sha256(f"{self.model}|{kind}|{transcript}".encode()).hexdigest()
+
+    async def _get_embedding(self, transcript: str) -> Optional[List[List[float]]]:
+        """
+        Embed a transcript once, sharing the request between concurrent callers.
+
+        The whole transcript is embedded, one vector per EMBEDDING_MAX_CHARS
+        window, so transcripts that only differ late on don't look identical.
+        """
+        digest = hashlib.sha256(transcript.encode()).hexdigest()
+        windows = [
+            transcript[start:start + EMBEDDING_MAX_CHARS]
+            for start in range(0, len(transcript), EMBEDDING_MAX_CHARS)
+        ]
+        try:
+            task = self._embedding_tasks.get(digest)
+            if task is None:
+                task = asyncio.ensure_future(self.client.embeddings.create(
+                    model=self.embedding_model,
+                    input=windows
+                ))
+                self._embedding_tasks[digest] = task
+                while len(self._embedding_tasks) > self.cache.max_entries:
+                    self._embedding_tasks.popitem(last=False)
+
+            response = await task
+            return [item.embedding for item in response.data]
+        except Exception:
+            # Semantic matching is best effort; fall back to exact keys only
+            self._embedding_tasks.pop(digest, None)
+            return None
 
     def _get_summary_prompt(self, transcript: str, summary_type: str) -> str:
         """Get the appropriate prompt for the summary type."""
-        base_prompt = f"Please summarize the following video transcript:\n\n{transcript}\n\n"
-        
+        return f"{PROMPT_SUMMARY_HEAD}{transcript}\n\n{self._get_summary_instructions(summary_type)}"
+
+    def _get_summary_instructions(self, summary_type: str) -> str:
+        """Get the instructions appended to summary prompts."""
         if summary_type == "brief":
-            return base_prompt + "Provide a brief, 2-3 sentence summary of the main points."
+            return PROMPT_BRIEF_TAIL
         elif summary_type == "key_points":
-            return base_prompt + "Extract and list the key points discussed in the video."
+            return PROMPT_KEY_POINTS_TAIL
         else:  # comprehensive
-            return base_prompt + (
-                "Provide a comprehensive summary that covers:\n"
-                "1. Main topic/purpose of the video\n"
-                "2. Key points and important details\n"
-                "3. Conclusions or outcomes\n"
-                "4. Any action items or next steps mentioned"
-            )
+            return PROMPT_COMP_TAIL
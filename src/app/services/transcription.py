@@ -1,42 +1,190 @@
-"""Transcription service using OpenAI Whisper."""
+"""Transcription service using OpenAI Whisper or a local faster-whisper model."""
 
+import asyncio
+import io
 import os
+import threading
+import wave
 from pathlib import Path
-from typing import Optional
-import openai
-from openai import OpenAI
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+from openai import AsyncOpenAI
+
+from .openai_client import get_async_openai_client
+
+# A path to an audio file, or 16 kHz mono int16 samples already in memory
+AudioInput = Union[Path, np.ndarray]
+SAMPLE_RATE = 16000
+
+
+class WhisperLocalBackend:
+    """Transcribe audio on local hardware with faster-whisper (CTranslate2)."""
+
+    def __init__(
+        self,
+        model_size: str = "large-v3",
+        device: str = "cuda",
+        compute_type: str = "int8_float16",
+        num_workers: int = 1
+    ):
+        """
+        Initialize the backend; the model is loaded on first use.
+
+        Args:
+            model_size: Whisper model name or path to a converted model
+            device: 'cuda', 'cpu' or 'auto'
+            compute_type: CTranslate2 quantization, e.g. 'int8_float16' or 'int8'
+            num_workers: Transcriptions the model runs in parallel when called
+                from several threads; each worker costs extra memory
+        """
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.num_workers = max(1, num_workers)
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self) -> Any:
+        """Load the model once, even when first called from several threads."""
+        with self._lock:
+            if self._model is None:
+                try:
+                    from faster_whisper import WhisperModel
+                except ImportError:
+                    raise RuntimeError(
+                        "faster-whisper is required for WHISPER_BACKEND=local: "
+                        "pip install \"video-extractor[local]\""
+                    )
+                self._model = WhisperModel(
+                    self.model_size,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    num_workers=self.num_workers
+                )
+            return self._model
+
+    def transcribe(self, audio: AudioInput, word_timestamps: bool = False) -> Dict[str, Any]:
+        """
+        Transcribe audio, skipping silence with the built-in VAD.
+
+        Args:
+            audio: Path to the audio file, or 16 kHz mono int16 samples
+            word_timestamps: Whether to compute word-level timestamps
+
+        Returns:
+            Dictionary shaped like transcribe_with_timestamps output
+        """
+        if isinstance(audio, np.ndarray):
+            # faster-whisper takes float samples directly; no file to decode
+            audio_input = audio.astype(np.float32) / 32768.0
+        else:
+            audio_input = str(audio)
+        segments, info = self._get_model().transcribe(
+            audio_input,
+            word_timestamps=word_timestamps,
+            vad_filter=True
+        )
+
+        segment_list = []
+        words = []
+        for segment in segments:
+            segment_list.append({
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text
+            })
+            for word in segment.words or []:
+                words.append({"start": word.start, "end": word.end, "word": word.word})
+
+        return {
+            "text": " ".join(segment["text"].strip() for segment in segment_list),
+            "language": info.language,
+            "duration": info.duration,
+            "words": words,
+            "segments": segment_list
+        }
 
 
 class TranscriptionService:
     """Service for transcribing audio to text using OpenAI Whisper."""
 
-    def __init__(self):
-        """Initialize the transcription service."""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY environment variable is required for transcription"
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        """
+        Initialize the transcription service.
+
+        Args:
+            client: Shared OpenAI client; the process-wide client is used when omitted
+        """
+        self.backend = os.getenv("WHISPER_BACKEND", "openai").lower()
+        self.client = None
+        self.local_backend: Optional[WhisperLocalBackend] = None
+        # Chunks of one long recording transcribed at the same time
+        self.chunk_concurrency = max(1, int(os.getenv("TRANSCRIBE_CONCURRENCY", "4")))
+
+        if self.backend == "local":
+            self.local_backend = WhisperLocalBackend(
+                model_size=os.getenv("WHISPER_MODEL", "large-v3"),
+                device=os.getenv("WHISPER_DEVICE", "cuda"),
+                compute_type=os.getenv("WHISPER_COMPUTE_TYPE", "int8_float16"),
+                num_workers=int(os.getenv("WHISPER_NUM_WORKERS", "1"))
             )
-        self.client = OpenAI(api_key=api_key)
+            return
 
-    async def transcribe_audio(self, audio_path: Path) -> str:
+        if client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError(
+                    "OPENAI_API_KEY environment variable is required for transcription"
+                )
+            client = get_async_openai_client(api_key)
+        self.client = client
+
+    async def warm_up(self) -> None:
+        """Load the local model and run one second of silence through it."""
+        if self.local_backend is not None:
+            silence = np.zeros(SAMPLE_RATE, dtype=np.int16)
+            await asyncio.to_thread(self.local_backend.transcribe, silence)
+
+    @property
+    def removes_silence(self) -> bool:
+        """Whether the backend skips silence itself (VAD), making trimming redundant."""
+        return self.local_backend is not None
+
+    async def transcribe_audio(self, audio: AudioInput) -> str:
         """
         Transcribe audio file to text using OpenAI Whisper.
         
         Args:
-            audio_path: Path to the audio file
+            audio: Path to the audio file, or 16 kHz mono int16 samples
             
         Returns:
             Transcribed text
         """
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        if isinstance(audio, Path) and not audio.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio}")
         
         try:
-            with open(audio_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
+            if self.local_backend is not None:
+                # Each call gets its own thread; the model's workers run them in parallel
+                result = await asyncio.to_thread(self.local_backend.transcribe, audio)
+                return result["text"]
+            
+            if isinstance(audio, np.ndarray):
+                # Wrap the samples in a WAV header in memory; no temp file
+                transcript = await self.client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=("audio.wav", self._wav_buffer(audio)),
+                    response_format="text"
+                )
+                return transcript if isinstance(transcript, str) else transcript.text
+            
+            with open(audio, "rb") as audio_file:
+                # Pass the open handle, not a path or bytes, so the multipart
+                # body is streamed from disk instead of read into memory
+                transcript = await self.client.audio.transcriptions.create(
                     model="whisper-1",
-                    file=audio_file,
+                    file=(audio.name, audio_file),
                     response_format="text"
                 )
             
@@ -45,6 +193,48 @@ class TranscriptionService:
         except Exception as e:
             raise RuntimeError(f"Transcription failed: {str(e)}")
 
+    async def transcribe_chunks(
+        self,
+        chunk_paths: List[Path],
+        on_chunk_done: Optional[Callable[[int, int], None]] = None
+    ) -> str:
+        """
+        Transcribe consecutive chunks of one recording in parallel.
+        
+        Args:
+            chunk_paths: Chunk audio files in playback order
+            on_chunk_done: Called with (completed, total) as each chunk finishes
+            
+        Returns:
+            Transcribed text of all chunks joined in order
+        """
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+        completed = 0
+
+        async def transcribe_chunk(chunk_path: Path) -> str:
+            nonlocal completed
+            async with semaphore:
+                text = await self.transcribe_audio(chunk_path)
+            completed += 1
+            if on_chunk_done is not None:
+                on_chunk_done(completed, len(chunk_paths))
+            return text.strip()
+
+        # gather keeps results in input order regardless of completion order
+        texts = await asyncio.gather(*(transcribe_chunk(path) for path in chunk_paths))
+        return " ".join(text for text in texts if text)
+
+    def _wav_buffer(self, samples: np.ndarray) -> io.BytesIO:
+        """Wrap 16 kHz mono int16 samples in an in-memory WAV file."""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as audio_file:
+            audio_file.setnchannels(1)
+            audio_file.setsampwidth(2)
+            audio_file.setframerate(SAMPLE_RATE)
+            audio_file.writeframes(samples.tobytes())
+        buffer.seek(0)
+        return buffer
+
     async def transcribe_with_timestamps(self, audio_path: Path) -> dict:
         """
         Transcribe audio with timestamps using OpenAI Whisper.
@@ -59,10 +249,17 @@ class TranscriptionService:
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
         try:
+            if self.local_backend is not None:
+                return await asyncio.to_thread(
+                    self.local_backend.transcribe, audio_path, True
+                )
+            
             with open(audio_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
+                # Pass the open handle, not a path or bytes, so the multipart
+                # body is streamed from disk instead of read into memory
+                transcript = await self.client.audio.transcriptions.create(
                     model="whisper-1",
-                    file=audio_file,
+                    file=(audio_path.name, audio_file),
                     response_format="verbose_json",
                     timestamp_granularities=["word", "segment"]
                 )
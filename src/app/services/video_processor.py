@@ -2,10 +2,47 @@
 
 import asyncio
 import subprocess
+from collections import OrderedDict, deque
+from fractions import Fraction
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import AsyncIterator, Deque, Dict, Any, Iterator, List, Optional, Tuple
 import json
+import mmap
+import re
 import tempfile
+import wave
+
+import numpy as np
+import orjson
+
+try:
+    import av
+except ImportError:  # pragma: no cover - falls back to ffmpeg subprocesses
+    av = None
+
+# Output format expected by the transcription service
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+# silencedetect markers in ffmpeg's stderr, e.g. b"silence_start: 12.5"
+SILENCE_EVENT_RE = re.compile(rb"silence_(start|end):\s*([-\d.]+)")
+
+# Loudness window for in-process silence detection, and how many windows
+# are converted to float at once
+VAD_WINDOW_S = 0.02
+VAD_BLOCK_WINDOWS = 3000
+
+# ffmpeg stderr lines kept for error messages
+STDERR_TAIL_LINES = 20
+
+# Number of ffprobe results kept in memory
+PROBE_CACHE_SIZE = 256
+
+# Bytes read from ffmpeg's stdout per PCM chunk
+PCM_CHUNK_BYTES = 1 << 16
+
+# Shortest pause a transcription chunk may be cut at (seconds)
+CHUNK_PAUSE_S = 0.1
 
 
 class VideoProcessor:
@@ -17,6 +54,13 @@ class VideoProcessor:
         self.silence_threshold = os.getenv("SILENCE_THRESHOLD", "-30dB")  # Silence threshold
         self.silence_duration = os.getenv("SILENCE_DURATION", "0.5")     # Minimum silence duration to detect (seconds)
         self.audio_padding = os.getenv("AUDIO_PADDING", "0.2")        # Padding around speech segments (seconds)
+        # 'silenceremove' trims in one filter pass; 'segments' detects silence
+        # ranges first and then cuts them out
+        self.silence_removal_mode = os.getenv("SILENCE_REMOVAL_MODE", "silenceremove").lower()
+        # Longest audio chunk transcribed in one request (seconds)
+        self.transcribe_chunk_s = float(os.getenv("TRANSCRIBE_CHUNK_S", "180"))
+        # ffprobe results keyed by (path, size, mtime, kind)
+        self._probe_cache: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
 
     async def extract_audio_with_silence_removal(self, video_path: Path) -> Path:
         """
@@ -28,19 +72,302 @@ class VideoProcessor:
         Returns:
             Path to the processed audio file with silence removed
         """
-        # First extract raw audio
-        raw_audio_path = await self.extract_audio(video_path)
-        
-        # Detect silence segments
-        silence_segments = await self.detect_silence(raw_audio_path)
+        if self.silence_removal_mode == "silenceremove":
+            return await self._remove_silence_single_pass(video_path)
+
+        if av is not None:
+            # Decode, resample and detect silence in-process in a single pass
+            return await asyncio.to_thread(self._process_audio_pyav, video_path)
+
+        # Extract audio and detect silence in a single ffmpeg run
+        raw_audio_path, silence_segments, duration = (
+            await self._extract_audio_detecting_silence(video_path)
+        )
         
-        # Remove silence and create optimized audio
+        # Remove silence and create optimized audio; the duration is already
+        # known from the samples written, so no ffprobe is needed
         optimized_audio_path = await self.remove_silence_segments(
-            raw_audio_path, silence_segments
+            raw_audio_path, silence_segments, duration
         )
         
         return optimized_audio_path
 
+    async def _remove_silence_single_pass(self, video_path: Path) -> Path:
+        """
+        Extract audio and drop silence with ffmpeg's silenceremove filter.
+        
+        Detection and removal happen while decoding, so there is no silence
+        segment bookkeeping and no second pass over the audio.
+        
+        Args:
+            video_path: Path to the input video file
+            
+        Returns:
+            Path to the audio file with silence removed
+        """
+        output_path = video_path.parent / f"{video_path.stem}_audio_no_silence.wav"
+        
+        if av is not None:
+            await asyncio.to_thread(
+                self._decode_audio_pyav, video_path, output_path, False, True
+            )
+            return output_path
+        
+        cmd = [
+            "ffmpeg",
+            "-i", str(video_path),
+            "-vn",  # No video
+            "-af", (
+                f"aresample={SAMPLE_RATE},"
+                f"silenceremove={self._silenceremove_options()},"
+                "aformat=sample_fmts=s16:channel_layouts=mono"
+            ),
+            "-acodec", "pcm_s16le",
+            "-y",
+            str(output_path)
+        ]
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            
+            stdout, stderr = await process.communicate()
+            
+            if process.returncode != 0:
+                raise RuntimeError(f"FFmpeg failed: {stderr.decode()}")
+            
+            return output_path
+            
+        except FileNotFoundError:
+            raise RuntimeError(
+                "FFmpeg not found. Please install ffmpeg: "
+                "brew install ffmpeg (macOS) or apt-get install ffmpeg (Ubuntu)"
+            )
+
+    def _silenceremove_options(self) -> str:
+        """Options for the silenceremove filter from the silence settings."""
+        return (
+            f"start_periods=1:start_duration=0.2:start_threshold={self.silence_threshold}:"
+            f"stop_periods=-1:stop_duration={self.silence_duration}:"
+            f"stop_threshold={self.silence_threshold}:"
+            f"start_silence={self.audio_padding}:stop_silence={self.audio_padding}"
+        )
+
+    async def _extract_audio_detecting_silence(
+        self, 
+        video_path: Path
+    ) -> Tuple[Path, List[Tuple[float, float]], float]:
+        """
+        Extract audio with ffmpeg while running silencedetect in the same pass.
+        
+        PCM is streamed over stdout into a WAV file while silence markers are
+        read from stderr concurrently, so the input is decoded only once.
+        
+        Args:
+            video_path: Path to the input video file
+            
+        Returns:
+            Path to the extracted audio file, the detected silence segments and
+            the audio duration in seconds
+        """
+        audio_path = video_path.parent / f"{video_path.stem}_audio.wav"
+        
+        cmd = [
+            "ffmpeg",
+            "-i", str(video_path),
+            "-vn",  # No video
+            "-af", (
+                f"aresample={SAMPLE_RATE},"
+                "aformat=sample_fmts=s16:channel_layouts=mono,"
+                f"silencedetect=noise={self.silence_threshold}:d={self.silence_duration}"
+            ),
+            "-f", "s16le",  # Raw PCM; the WAV header is written here
+            "-nostats",  # Progress lines end in \r, not newlines
+            "pipe:1"
+        ]
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "FFmpeg not found. Please install ffmpeg: "
+                "brew install ffmpeg (macOS) or apt-get install ffmpeg (Ubuntu)"
+            )
+        
+        async def read_stdout() -> int:
+            written = 0
+            with wave.open(str(audio_path), "wb") as audio_file:
+                audio_file.setnchannels(1)
+                audio_file.setsampwidth(SAMPLE_WIDTH)
+                audio_file.setframerate(SAMPLE_RATE)
+                while chunk := await process.stdout.read(1 << 16):
+                    audio_file.writeframes(chunk)
+                    written += len(chunk)
+            return written
+        
+        error_tail: Deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+        written, silence_events = await asyncio.gather(
+            read_stdout(), self._read_silence_events(process.stderr, error_tail)
+        )
+        await process.wait()
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"FFmpeg failed: {b''.join(error_tail).decode(errors='replace')}")
+        
+        duration = written / (SAMPLE_WIDTH * SAMPLE_RATE)
+        return audio_path, self._parse_silence_output(silence_events), duration
+
+    def _process_audio_pyav(self, video_path: Path) -> Path:
+        """Extract audio and remove silence with libav, decoding the input once."""
+        audio_path = video_path.parent / f"{video_path.stem}_audio.wav"
+        silence_segments = self._decode_audio_pyav(video_path, audio_path, detect_silence=True)
+
+        with wave.open(str(audio_path), "rb") as raw_audio:
+            duration = raw_audio.getnframes() / SAMPLE_RATE
+
+        speech_segments = self._get_speech_segments(silence_segments, duration)
+        if not silence_segments or not speech_segments:
+            return audio_path
+
+        output_path = audio_path.parent / f"{audio_path.stem}_no_silence.wav"
+        padding = float(self.audio_padding)
+
+        # Copy the padded speech ranges out of the decoded audio; no second decode
+        with wave.open(str(audio_path), "rb") as raw_audio, \
+                wave.open(str(output_path), "wb") as trimmed_audio:
+            trimmed_audio.setnchannels(1)
+            trimmed_audio.setsampwidth(SAMPLE_WIDTH)
+            trimmed_audio.setframerate(SAMPLE_RATE)
+
+            for start, end in speech_segments:
+                first = int(max(0.0, start - padding) * SAMPLE_RATE)
+                last = int(min(duration, end + padding) * SAMPLE_RATE)
+                raw_audio.setpos(first)
+                trimmed_audio.writeframes(raw_audio.readframes(last - first))
+
+        return output_path
+
+    def _filtered_audio_frames(
+        self,
+        video_path: Path,
+        detect_silence: bool = False,
+        remove_silence: bool = False
+    ) -> Iterator[Any]:
+        """
+        Decode the first audio stream and yield 16 kHz mono s16 frames from libav.
+
+        Args:
+            video_path: Path to the input video file
+            detect_silence: Also run silencedetect in the same filter graph
+            remove_silence: Also run silenceremove in the same filter graph
+
+        Yields:
+            Filtered av.AudioFrame objects, carrying silencedetect metadata
+        """
+        try:
+            container = av.open(str(video_path))
+        except av.error.FFmpegError as e:
+            raise RuntimeError(f"Failed to open video: {e}")
+
+        with container:
+            if not container.streams.audio:
+                raise RuntimeError("Audio extraction failed - no audio stream found")
+            stream = container.streams.audio[0]
+
+            graph = av.filter.Graph()
+            nodes = [
+                graph.add_abuffer(template=stream),
+                graph.add("aresample", str(SAMPLE_RATE)),
+            ]
+            if remove_silence:
+                nodes.append(graph.add("silenceremove", self._silenceremove_options()))
+            if detect_silence:
+                nodes.append(graph.add(
+                    "silencedetect",
+                    f"noise={self.silence_threshold}:d={self.silence_duration}"
+                ))
+            # Last, since silenceremove outputs float samples
+            nodes.append(graph.add("aformat", "sample_fmts=s16:channel_layouts=mono"))
+            nodes.append(graph.add("abuffersink"))
+            graph.link_nodes(*nodes).configure()
+
+            def drain() -> Iterator[Any]:
+                while True:
+                    try:
+                        yield graph.pull()
+                    except (av.error.BlockingIOError, av.error.EOFError):
+                        return
+
+            try:
+                for frame in container.decode(stream):
+                    graph.push(frame)
+                    yield from drain()
+                graph.push(None)
+                yield from drain()
+            except av.error.FFmpegError as e:
+                raise RuntimeError(f"Audio extraction failed: {e}")
+
+    def _decode_audio_pyav(
+        self,
+        video_path: Path,
+        audio_path: Path,
+        detect_silence: bool = False,
+        remove_silence: bool = False
+    ) -> List[Tuple[float, float]]:
+        """
+        Decode the first audio stream to a 16 kHz mono WAV file with libav.
+
+        Args:
+            video_path: Path to the input video file
+            audio_path: Path of the WAV file to write
+            detect_silence: Also run silencedetect in the same filter graph
+            remove_silence: Also run silenceremove in the same filter graph
+
+        Returns:
+            List of (start_time, end_time) tuples for silence segments
+        """
+        silence_segments: List[Tuple[float, float]] = []
+        silence_start = None
+        frames = self._filtered_audio_frames(video_path, detect_silence, remove_silence)
+
+        with wave.open(str(audio_path), "wb") as audio_file:
+            audio_file.setnchannels(1)
+            audio_file.setsampwidth(SAMPLE_WIDTH)
+            audio_file.setframerate(SAMPLE_RATE)
+
+            for frame in frames:
+                audio_file.writeframes(frame.to_ndarray().tobytes())
+
+                metadata = frame.metadata
+                if "lavfi.silence_start" in metadata:
+                    silence_start = float(metadata["lavfi.silence_start"])
+                if "lavfi.silence_end" in metadata and silence_start is not None:
+                    silence_segments.append(
+                        (silence_start, float(metadata["lavfi.silence_end"]))
+                    )
+                    silence_start = None
+
+            if silence_start is not None:
+                # Silence ran to the end of the audio
+                duration = audio_file.tell() / SAMPLE_RATE
+                silence_segments.append((silence_start, duration))
+
+        return silence_segments
+
+    def _decode_pcm_pyav(self, video_path: Path) -> np.ndarray:
+        """Decode the first audio stream to 16 kHz mono samples in memory."""
+        pcm = bytearray()
+        for frame in self._filtered_audio_frames(video_path):
+            pcm += frame.to_ndarray().tobytes()
+        return np.frombuffer(pcm, dtype=np.int16)
+
     async def detect_silence(self, audio_path: Path) -> List[Tuple[float, float]]:
         """
         Detect silence segments in audio file.
@@ -51,6 +378,12 @@ class VideoProcessor:
         Returns:
             List of (start_time, end_time) tuples for silence segments
         """
+        sample_rate = self._pcm16_mono_rate(audio_path)
+        if sample_rate:
+            # Our own extracted audio: measure loudness in-process, no ffmpeg run
+            samples = self._mmap_wav(audio_path)
+            return await asyncio.to_thread(self._detect_silence_samples, samples, sample_rate)
+        
         output_path = audio_path.parent / f"{audio_path.stem}_silence_detect.txt"
         
         cmd = [
@@ -58,6 +391,7 @@ class VideoProcessor:
             "-i", str(audio_path),
             "-af", f"silencedetect=noise={self.silence_threshold}:d={self.silence_duration}",
             "-f", "null",
+            "-nostats",  # Progress lines end in \r, not newlines
             "-y",
             str(output_path)
         ]
@@ -65,49 +399,221 @@ class VideoProcessor:
         try:
             process = await asyncio.create_subprocess_exec(
                 *cmd,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE
             )
             
-            stdout, stderr = await process.communicate()
+            # Parse silence markers as ffmpeg emits them
+            silence_events = await self._read_silence_events(process.stderr)
+            await process.wait()
             
             if process.returncode != 0:
                 # Silence detection failed, return empty list (process full audio)
                 return []
             
-            # Parse silence detection output
-            silence_segments = self._parse_silence_output(stderr.decode())
-            return silence_segments
+            return self._parse_silence_output(silence_events)
             
         except FileNotFoundError:
             raise RuntimeError("FFmpeg not found for silence detection")
     
-    def _parse_silence_output(self, output: str) -> List[Tuple[float, float]]:
+    def _detect_silence_samples(
+        self, 
+        samples: np.ndarray, 
+        sample_rate: int = SAMPLE_RATE,
+        min_silence_s: Optional[float] = None
+    ) -> List[Tuple[float, float]]:
+        """
+        Find silence in 16-bit PCM samples by thresholding windowed RMS level.
+        
+        Args:
+            samples: Mono int16 samples
+            sample_rate: Sample rate of the samples
+            min_silence_s: Shortest silence to report; defaults to SILENCE_DURATION
+            
+        Returns:
+            List of (start_time, end_time) tuples for silence segments
+        """
+        window = max(1, int(sample_rate * VAD_WINDOW_S))
+        window_count = len(samples) // window
+        if window_count == 0:
+            return []
+        
+        # Per-window level in dBFS, computed in blocks to bound temporary memory
+        levels = np.empty(window_count, dtype=np.float32)
+        block = VAD_BLOCK_WINDOWS
+        for first in range(0, window_count, block):
+            last = min(first + block, window_count)
+            frames = samples[first * window:last * window].astype(np.float32)
+            frames = frames.reshape(last - first, window) / 32768.0
+            rms = np.sqrt(np.mean(np.square(frames), axis=1))
+            levels[first:last] = 20 * np.log10(rms + 1e-9)
+        
+        silent = levels < self._silence_threshold_db()
+        
+        # Run-length encode the silent windows into [start, end) window ranges
+        edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        
+        window_s = window / sample_rate
+        if min_silence_s is None:
+            min_silence_s = float(self.silence_duration)
+        min_windows = min_silence_s / window_s
+        keep = (ends - starts) >= min_windows
+        
+        return list(zip(
+            (starts[keep] * window_s).tolist(),
+            (ends[keep] * window_s).tolist()
+        ))
+
+    async def chunk_audio_vad(self, audio_path: Path) -> List[Tuple[float, float]]:
+        """
+        Plan transcription chunks that end on pauses in speech.
+        
+        Args:
+            audio_path: Path to a 16-bit mono WAV file
+            
+        Returns:
+            Consecutive (start_time, end_time) ranges covering the whole file;
+            a single range when the audio is short or not 16-bit mono PCM
+        """
+        sample_rate = self._pcm16_mono_rate(audio_path)
+        if not sample_rate:
+            return [(0.0, await self._get_audio_duration(audio_path))]
+        
+        samples = self._mmap_wav(audio_path)
+        duration = len(samples) / sample_rate
+        if duration <= self.transcribe_chunk_s:
+            return [(0.0, duration)]
+        
+        pauses = await asyncio.to_thread(
+            self._detect_silence_samples, samples, sample_rate, CHUNK_PAUSE_S
+        )
+        return self._plan_chunks(pauses, duration)
+
+    def _plan_chunks(
+        self, 
+        pauses: List[Tuple[float, float]], 
+        duration: float
+    ) -> List[Tuple[float, float]]:
+        """Cut at the latest pause midpoint in each window, or hard-cut if there is none."""
+        max_chunk = self.transcribe_chunk_s
+        cuts = np.array(sorted((start + end) / 2 for start, end in pauses))
+        
+        chunks = []
+        start = 0.0
+        while duration - start > max_chunk:
+            # Don't accept a pause so early that the chunk would be tiny
+            window = cuts[(cuts > start + max_chunk / 2) & (cuts <= start + max_chunk)]
+            end = float(window[-1]) if len(window) else start + max_chunk
+            chunks.append((start, end))
+            start = end
+        chunks.append((start, duration))
+        return chunks
+
+    async def split_audio(
+        self, 
+        audio_path: Path, 
+        chunks: List[Tuple[float, float]], 
+        output_dir: Path
+    ) -> List[Path]:
+        """
+        Write each time range of a 16-bit mono WAV file to its own WAV file.
+        
+        Args:
+            audio_path: Path to the source audio
+            chunks: (start_time, end_time) ranges to extract
+            output_dir: Directory for the chunk files
+            
+        Returns:
+            Chunk file paths in the same order as the ranges
+        """
+        return await asyncio.to_thread(self._write_chunks, audio_path, chunks, output_dir)
+
+    def _write_chunks(
+        self, 
+        audio_path: Path, 
+        chunks: List[Tuple[float, float]], 
+        output_dir: Path
+    ) -> List[Path]:
+        """Copy sample ranges out of the mapped source; no decoding involved."""
+        sample_rate = self._pcm16_mono_rate(audio_path) or SAMPLE_RATE
+        samples = self._mmap_wav(audio_path)
+        
+        chunk_paths = []
+        for index, (start, end) in enumerate(chunks):
+            chunk_path = output_dir / f"{audio_path.stem}_chunk{index:04d}.wav"
+            with wave.open(str(chunk_path), "wb") as chunk_file:
+                chunk_file.setnchannels(1)
+                chunk_file.setsampwidth(SAMPLE_WIDTH)
+                chunk_file.setframerate(sample_rate)
+                chunk_file.writeframes(samples[int(start * sample_rate):int(end * sample_rate)])
+            chunk_paths.append(chunk_path)
+        return chunk_paths
+
+    def _silence_threshold_db(self) -> float:
+        """Silence threshold in dBFS; like silencedetect, accepts '-30dB' or a ratio."""
+        threshold = self.silence_threshold.strip()
+        if threshold.lower().endswith("db"):
+            return float(threshold[:-2])
+        return 20 * float(np.log10(max(float(threshold), 1e-9)))
+
+    def _pcm16_mono_rate(self, audio_path: Path) -> Optional[int]:
+        """Sample rate of a 16-bit mono PCM WAV file, or None for anything else."""
+        try:
+            with wave.open(str(audio_path), "rb") as audio_file:
+                if audio_file.getnchannels() == 1 and audio_file.getsampwidth() == SAMPLE_WIDTH:
+                    return audio_file.getframerate()
+        except (wave.Error, EOFError, OSError):
+            pass
+        return None
+
+    async def _read_silence_events(
+        self, 
+        stream: asyncio.StreamReader, 
+        error_tail: Optional[Deque[bytes]] = None
+    ) -> bytes:
+        """
+        Read ffmpeg's stderr line by line, keeping only silencedetect markers.
+        
+        Args:
+            stream: The process stderr stream
+            error_tail: Receives the last lines, for error reporting
+            
+        Returns:
+            The silence marker lines, ready for _parse_silence_output
+        """
+        events = []
+        async for line in stream:
+            if SILENCE_EVENT_RE.search(line):
+                events.append(line)
+            if error_tail is not None:
+                error_tail.append(line)
+        return b"".join(events)
+
+    def _parse_silence_output(self, output: bytes) -> List[Tuple[float, float]]:
         """Parse FFmpeg silence detection output."""
         silence_segments = []
-        lines = output.split('\n')
-        
         silence_start = None
-        for line in lines:
-            if 'silence_start:' in line:
-                try:
-                    silence_start = float(line.split('silence_start: ')[1].split()[0])
-                except (IndexError, ValueError):
-                    continue
-            elif 'silence_end:' in line and silence_start is not None:
-                try:
-                    silence_end = float(line.split('silence_end: ')[1].split()[0])
-                    silence_segments.append((silence_start, silence_end))
-                    silence_start = None
-                except (IndexError, ValueError):
-                    continue
+        
+        for kind, value in SILENCE_EVENT_RE.findall(output):
+            try:
+                timestamp = float(value)
+            except ValueError:
+                continue
+            if kind == b"start":
+                silence_start = timestamp
+            elif silence_start is not None:
+                silence_segments.append((silence_start, timestamp))
+                silence_start = None
         
         return silence_segments
 
     async def remove_silence_segments(
         self, 
         audio_path: Path, 
-        silence_segments: List[Tuple[float, float]]
+        silence_segments: List[Tuple[float, float]],
+        duration: Optional[float] = None
     ) -> Path:
         """
         Remove silence segments from audio file.
@@ -115,6 +621,7 @@ class VideoProcessor:
         Args:
             audio_path: Path to the input audio file
             silence_segments: List of silence segments to remove
+            duration: Audio duration in seconds, if the caller already knows it
             
         Returns:
             Path to the audio file with silence removed
@@ -126,7 +633,8 @@ class VideoProcessor:
         output_path = audio_path.parent / f"{audio_path.stem}_no_silence.wav"
         
         # Get total audio duration
-        duration = await self._get_audio_duration(audio_path)
+        if duration is None:
+            duration = await self._get_audio_duration(audio_path)
         
         # Create speech segments (inverse of silence segments)
         speech_segments = self._get_speech_segments(silence_segments, duration)
@@ -135,26 +643,19 @@ class VideoProcessor:
             # No speech detected, return original file
             return audio_path
         
-        # Build FFmpeg filter for concatenating speech segments
-        filter_parts = []
-        input_parts = []
-        
-        for i, (start, end) in enumerate(speech_segments):
-            # Add padding around speech segments
-            padded_start = max(0, start - float(self.audio_padding))
-            padded_end = min(duration, end + float(self.audio_padding))
-            
-            filter_parts.append(f"[0:a]atrim=start={padded_start}:end={padded_end},asetpts=PTS-STARTPTS[a{i}]")
-            input_parts.append(f"[a{i}]")
-        
-        # Concatenate all speech segments
-        concat_filter = "".join(filter_parts) + f"{''.join(input_parts)}concat=n={len(speech_segments)}:v=0:a=1[out]"
+        # Keep samples inside any padded speech segment with a single aselect,
+        # rather than one atrim branch per segment joined by concat
+        padding = float(self.audio_padding)
+        select_expr = "+".join(
+            f"between(t,{max(0.0, start - padding):.3f},{min(duration, end + padding):.3f})"
+            for start, end in speech_segments
+        )
+        select_filter = f"aselect='{select_expr}',asetpts=N/SR/TB"
         
         cmd = [
             "ffmpeg",
             "-i", str(audio_path),
-            "-filter_complex", concat_filter,
-            "-map", "[out]",
+            "-af", select_filter,
             "-acodec", "pcm_s16le",
             "-ar", "16000",
             "-ac", "1",
@@ -189,22 +690,49 @@ class VideoProcessor:
         if not silence_segments:
             return [(0.0, total_duration)]
         
-        speech_segments = []
-        current_pos = 0.0
-        
-        for silence_start, silence_end in sorted(silence_segments):
-            if current_pos < silence_start:
-                speech_segments.append((current_pos, silence_start))
-            current_pos = max(current_pos, silence_end)
+        silence = np.asarray(silence_segments, dtype=np.float64)
+        silence = silence[silence[:, 0].argsort(kind="stable")]
         
-        # Add final segment if there's speech after the last silence
-        if current_pos < total_duration:
-            speech_segments.append((current_pos, total_duration))
+        # Speech runs from the end of each silence (running max, so overlapping
+        # silences merge) to the start of the next one
+        starts = np.concatenate(([0.0], np.maximum.accumulate(silence[:, 1])))
+        ends = np.concatenate((silence[:, 0], [total_duration]))
+        mask = starts < ends
         
-        return speech_segments
+        return list(zip(starts[mask].tolist(), ends[mask].tolist()))
+
+    def _probe_key(self, path: Path, kind: str) -> Optional[Tuple[Any, ...]]:
+        """Cache key that changes whenever the file is rewritten."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (str(path), stat.st_size, stat.st_mtime_ns, kind)
+
+    def _store_probe(self, key: Optional[Tuple[Any, ...]], value: Any) -> None:
+        """Remember a probe result, evicting the least recently stored."""
+        if key is None:
+            return
+        self._probe_cache[key] = value
+        self._probe_cache.move_to_end(key)
+        while len(self._probe_cache) > PROBE_CACHE_SIZE:
+            self._probe_cache.popitem(last=False)
 
     async def _get_audio_duration(self, audio_path: Path) -> float:
         """Get audio file duration in seconds."""
+        key = self._probe_key(audio_path, "duration")
+        if key in self._probe_cache:
+            return self._probe_cache[key]
+        
+        # Our own WAV output: the header has the answer, no ffprobe needed
+        try:
+            with wave.open(str(audio_path), "rb") as audio_file:
+                duration = audio_file.getnframes() / audio_file.getframerate()
+            self._store_probe(key, duration)
+            return duration
+        except (wave.Error, EOFError, OSError):
+            pass
+        
         cmd = [
             "ffprobe",
             "-v", "quiet",
@@ -223,7 +751,9 @@ class VideoProcessor:
             stdout, stderr = await process.communicate()
             
             if process.returncode == 0:
-                return float(stdout.decode().strip())
+                duration = float(stdout.decode().strip())
+                self._store_probe(key, duration)
+                return duration
             else:
                 return 0.0
                 
@@ -242,6 +772,10 @@ class VideoProcessor:
         """
         audio_path = video_path.parent / f"{video_path.stem}_audio.wav"
         
+        if av is not None:
+            await asyncio.to_thread(self._decode_audio_pyav, video_path, audio_path)
+            return audio_path
+        
         # Use ffmpeg to extract audio
         cmd = [
             "ffmpeg",
@@ -277,9 +811,116 @@ class VideoProcessor:
                 "brew install ffmpeg (macOS) or apt-get install ffmpeg (Ubuntu)"
             )
     
+    async def extract_audio_samples(self, video_path: Path) -> np.ndarray:
+        """
+        Extract audio and expose its samples without reading the file into memory.
+        
+        Args:
+            video_path: Path to the input video file
+            
+        Returns:
+            Read-only int16 array of 16 kHz mono samples backed by a memory map
+        """
+        audio_path = await self.extract_audio(video_path)
+        return self._mmap_wav(audio_path)
+
+    async def extract_audio_pcm(self, video_path: Path) -> np.ndarray:
+        """
+        Decode audio straight into memory, without writing a WAV file.
+        
+        Args:
+            video_path: Path to the input video file
+            
+        Returns:
+            int16 array of 16 kHz mono samples
+        """
+        if av is not None:
+            return await asyncio.to_thread(self._decode_pcm_pyav, video_path)
+        
+        pcm = bytearray()
+        async for chunk in self.stream_audio_pcm(video_path):
+            pcm += chunk
+        return np.frombuffer(pcm, dtype=np.int16)
+
+    async def stream_audio_pcm(self, video_path: Path) -> AsyncIterator[bytes]:
+        """
+        Stream raw 16 kHz mono s16le audio from ffmpeg's stdout.
+        
+        Args:
+            video_path: Path to the input video file
+            
+        Yields:
+            PCM byte chunks as ffmpeg produces them
+        """
+        cmd = [
+            "ffmpeg",
+            "-i", str(video_path),
+            "-vn",
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "-ar", str(SAMPLE_RATE),
+            "-ac", "1",
+            "-nostats",
+            "pipe:1"
+        ]
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "FFmpeg not found. Please install ffmpeg: "
+                "brew install ffmpeg (macOS) or apt-get install ffmpeg (Ubuntu)"
+            )
+        
+        # Drain stderr alongside stdout so a chatty ffmpeg can't block on it
+        error_tail: Deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+        stderr_task = asyncio.create_task(self._read_silence_events(process.stderr, error_tail))
+        try:
+            while chunk := await process.stdout.read(PCM_CHUNK_BYTES):
+                yield chunk
+            await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            await stderr_task
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"FFmpeg failed: {b''.join(error_tail).decode(errors='replace')}")
+
+    def _mmap_wav(self, audio_path: Path) -> np.ndarray:
+        """Map a 16-bit PCM WAV file and view its samples as a zero-copy array."""
+        with open(audio_path, "rb") as audio_file:
+            # The map keeps its own handle to the file, so it outlives this block
+            mapped = mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        offset, size = self._wav_data_chunk(mapped)
+        return np.frombuffer(mapped, dtype=np.int16, count=size // SAMPLE_WIDTH, offset=offset)
+
+    def _wav_data_chunk(self, data: mmap.mmap) -> Tuple[int, int]:
+        """Find the offset and size of the sample data in a RIFF/WAVE buffer."""
+        if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+            raise RuntimeError("Not a WAV file")
+        
+        # Walk the chunks; ffmpeg may write LIST chunks before the samples
+        position = 12
+        while position + 8 <= len(data):
+            chunk_id = data[position:position + 4]
+            chunk_size = int.from_bytes(data[position + 4:position + 8], "little")
+            if chunk_id == b"data":
+                start = position + 8
+                return start, min(chunk_size, len(data) - start)
+            position += 8 + chunk_size + (chunk_size & 1)
+        
+        raise RuntimeError("WAV file has no data chunk")
+
     async def get_video_info(self, video_path: Path) -> Dict[str, Any]:
         """
-        Get video metadata using ffprobe.
+        Get video metadata with PyAV, or ffprobe when PyAV is not installed.
         
         Args:
             video_path: Path to the video file
@@ -287,6 +928,19 @@ class VideoProcessor:
         Returns:
             Dictionary containing video metadata
         """
+        key = self._probe_key(video_path, "info")
+        if key in self._probe_cache:
+            return self._probe_cache[key]
+        
+        if av is not None:
+            # Read the container headers in-process instead of spawning ffprobe
+            try:
+                video_info = await asyncio.to_thread(self._probe_video_pyav, video_path)
+            except av.FFmpegError as e:
+                raise RuntimeError(f"Failed to read video metadata: {e}")
+            self._store_probe(key, video_info)
+            return video_info
+        
         cmd = [
             "ffprobe",
             "-v", "quiet",
@@ -308,20 +962,19 @@ class VideoProcessor:
             if process.returncode != 0:
                 raise RuntimeError(f"FFprobe failed: {stderr.decode()}")
             
-            metadata = json.loads(stdout.decode())
+            metadata = orjson.loads(stdout)
             
             # Extract useful information
             format_info = metadata.get("format", {})
-            video_stream = None
-            audio_stream = None
             
+            # First stream of each codec type
+            streams_by_type: Dict[Any, Dict[str, Any]] = {}
             for stream in metadata.get("streams", []):
-                if stream.get("codec_type") == "video" and not video_stream:
-                    video_stream = stream
-                elif stream.get("codec_type") == "audio" and not audio_stream:
-                    audio_stream = stream
+                streams_by_type.setdefault(stream.get("codec_type"), stream)
+            video_stream = streams_by_type.get("video")
+            audio_stream = streams_by_type.get("audio")
             
-            return {
+            video_info = {
                 "duration": float(format_info.get("duration", 0)),
                 "size": int(format_info.get("size", 0)),
                 "bitrate": int(format_info.get("bit_rate", 0)),
@@ -339,20 +992,45 @@ class VideoProcessor:
                 }
             }
             
+            self._store_probe(key, video_info)
+            return video_info
+            
         except FileNotFoundError:
             raise RuntimeError(
                 "FFprobe not found. Please install ffmpeg: "
                 "brew install ffmpeg (macOS) or apt-get install ffmpeg (Ubuntu)"
             )
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, orjson.JSONDecodeError) as e:
             raise RuntimeError(f"Failed to parse video metadata: {e}")
     
+    def _probe_video_pyav(self, video_path: Path) -> Dict[str, Any]:
+        """Collect the same metadata as the ffprobe path from libavformat directly."""
+        with av.open(str(video_path)) as container:
+            video_stream = container.streams.video[0] if container.streams.video else None
+            audio_stream = container.streams.audio[0] if container.streams.audio else None
+            fps = video_stream.base_rate if video_stream else None
+            
+            return {
+                "duration": (container.duration or 0) / av.time_base,
+                "size": video_path.stat().st_size,
+                "bitrate": container.bit_rate or 0,
+                "format_name": container.format.name,
+                "video": {
+                    "codec": video_stream.codec_context.name if video_stream else "",
+                    "width": video_stream.codec_context.width if video_stream else 0,
+                    "height": video_stream.codec_context.height if video_stream else 0,
+                    "fps": float(fps) if fps else 0
+                },
+                "audio": {
+                    "codec": audio_stream.codec_context.name if audio_stream else "",
+                    "sample_rate": audio_stream.codec_context.sample_rate if audio_stream else 0,
+                    "channels": audio_stream.codec_context.channels if audio_stream else 0
+                }
+            }
+    
     def _parse_fps(self, fps_string: str) -> float:
         """Parse fps from ffprobe format like '30/1' or '29.97'."""
         try:
-            if "/" in fps_string:
-                num, den = fps_string.split("/")
-                return float(num) / float(den) if float(den) != 0 else 0
-            return float(fps_string)
+            return float(Fraction(fps_string))
         except (ValueError, ZeroDivisionError):
             return 0.0
@@ -1,28 +1,85 @@
 """FastAPI web application for video processing and transcription."""
 
+import asyncio
+import atexit
+import hashlib
+import io
+import json
 import os
-import tempfile
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+from urllib.parse import quote
 
 import aiofiles
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request
-from fastapi.responses import JSONResponse
+import filetype
+from fastapi import BackgroundTasks, Depends, FastAPI, File, UploadFile, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from .services.video_processor import VideoProcessor
-from .services.transcription import TranscriptionService
+try:
+    from prometheus_client import Counter, Histogram
+    from prometheus_fastapi_instrumentator import Instrumentator
+except ImportError:  # pragma: no cover - metrics are optional
+    Instrumentator = None
+
+from .services.cache import ResultCache
+from .services.scratch import ScratchPool
+from .services.video_processor import SAMPLE_RATE, VideoProcessor
+from .services.transcription import AudioInput, TranscriptionService
 from .services.summarization import SummarizationService
+from .services.openai_client import close_async_openai_client, get_async_openai_client
 
 # Configuration for large file uploads
 MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "2000"))  # 2GB default
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1 << 20  # Stream uploads to disk 1 MiB at a time
+COPY_RANGE_SIZE = 1 << 26  # Bytes per copy_file_range call for spooled uploads
+# JSON lines file receiving per-chunk progress events (disabled when unset)
+PROGRESS_EVENTS_PATH = os.getenv("PROGRESS_EVENTS_PATH")
+PROGRESS_MAX_ENTRIES = 256  # Videos whose latest progress GET /progress/{hash} can report
+VIDEO_SNIFF_BYTES = 4096  # Enough of the header to recognize any container
+# MPEG transport streams: a sync byte starts every 188-byte packet (192 in BDAV)
+TS_SYNC_BYTE = 0x47
+TS_PACKET_SIZE = 188
+TS_MIN_PACKETS = 3
+REPORT_CHUNK_CHARS = 64 * 1024  # Transcript characters per streamed report chunk
+# Scratch space one request may fill: the upload plus the audio and chunks cut from it
+SCRATCH_SLOT_BYTES = 2 * MAX_FILE_SIZE_BYTES
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build and warm up the OpenAI client and services once for every request."""
+    app.state.openai_client = get_async_openai_client()
+    app.state.transcription_service = TranscriptionService(app.state.openai_client)
+    app.state.summarization_service = SummarizationService(app.state.openai_client)
+    app.state.scratch_pool = ScratchPool.from_env(slot_bytes=SCRATCH_SLOT_BYTES)
+    # Load models and tokenizers now so the first request doesn't pay for it
+    await asyncio.gather(
+        app.state.transcription_service.warm_up(),
+        app.state.summarization_service.warm_up()
+    )
+    try:
+        yield
+    finally:
+        await app.state.summarization_service.close()
+        del app.state.transcription_service
+        del app.state.summarization_service
+        del app.state.openai_client
+        app.state.scratch_pool.close()
+        del app.state.scratch_pool
+        await close_async_openai_client()
+
 
 app = FastAPI(
     title="Video Extractor API",
     description="Extract audio, generate transcripts and summaries from videos",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware for cross-origin requests
@@ -34,10 +91,54 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
+# Expose request metrics at /metrics when the metrics extra is installed
+STAGE_SECONDS = None
+RESULT_CACHE_LOOKUPS = None
+if Instrumentator is not None:
+    Instrumentator().instrument(app).expose(app)
+    STAGE_SECONDS = Histogram(
+        "video_extractor_stage_seconds",
+        "Time spent in each processing stage",
+        ["stage"]
+    )
+    RESULT_CACHE_LOOKUPS = Counter(
+        "video_extractor_result_cache_lookups_total",
+        "Transcript and summary cache lookups",
+        ["kind", "result"]
+    )
+
+# Initialize services; the OpenAI-backed ones are created in lifespan()
 video_processor = VideoProcessor()
-transcription_service = TranscriptionService()
-summarization_service = SummarizationService()
+result_cache = ResultCache.from_env()
+# Latest progress event per video, served by GET /progress/{content_hash}
+transcription_progress: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def get_transcription_service(request: Request) -> TranscriptionService:
+    """Dependency returning the app-wide transcription service."""
+    state = request.app.state
+    if not hasattr(state, "transcription_service"):
+        # Lifespan did not run (e.g. a TestClient used without a with block)
+        state.transcription_service = TranscriptionService()
+    return state.transcription_service
+
+
+def get_summarization_service(request: Request) -> SummarizationService:
+    """Dependency returning the app-wide summarization service."""
+    state = request.app.state
+    if not hasattr(state, "summarization_service"):
+        state.summarization_service = SummarizationService()
+    return state.summarization_service
+
+
+def get_scratch_pool(request: Request) -> ScratchPool:
+    """Dependency returning the app-wide pool of upload scratch directories."""
+    state = request.app.state
+    if not hasattr(state, "scratch_pool"):
+        # Lifespan did not run, so nothing else will remove the slots
+        state.scratch_pool = ScratchPool.from_env(slot_bytes=SCRATCH_SLOT_BYTES)
+        atexit.register(state.scratch_pool.close)
+    return state.scratch_pool
 
 
 class ProcessingResult(BaseModel):
@@ -48,6 +149,39 @@ class ProcessingResult(BaseModel):
     video_duration: float
     optimized_duration: float = 0.0  # Duration after silence removal
     silence_removed_percent: float = 0.0  # Percentage of silence removed
+    stage_times: Dict[str, float] = {}  # Seconds spent in each processing stage
+    content_hash: str = ""  # Key for /download/{content_hash}/report.md
+    summary_url: Optional[str] = None  # Set when the summary is generated in the background
+
+
+class BatchSummaryRequest(BaseModel):
+    """Transcripts to summarize through the OpenAI Batch API."""
+    transcripts: Dict[str, str]  # Caller-chosen ID (e.g. video ID) -> transcript
+    summary_type: str = "comprehensive"
+
+
+class BatchSummaryStatus(BaseModel):
+    """Status and results of a batch summarization job."""
+    id: str
+    status: str
+    summaries: Dict[str, str] = {}
+    errors: Dict[str, Any] = {}
+
+
+class SummaryResult(BaseModel):
+    """Summary of a processed video, generated after its transcript was returned."""
+    content_hash: str
+    status: str  # "pending", "completed" or "failed"
+    summary: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ProgressStatus(BaseModel):
+    """Latest progress of a video being processed."""
+    content_hash: str
+    stage: str
+    completed: int
+    total: int
 
 
 @app.get("/healthz")
@@ -57,7 +191,7 @@ async def health_check() -> Dict[str, str]:
 
 
 @app.get("/")
-async def root() -> Dict[str, str]:
+async def root() -> Dict[str, Any]:
     """Root endpoint with API information."""
     return {
         "message": "Video Extractor API",
@@ -65,11 +199,42 @@ async def root() -> Dict[str, str]:
         "endpoints": {
             "health": "/healthz",
             "upload": "/upload-video",
-            "process": "/process-video"
+            "process": "/process-video",
+            "batch_summarize": "/api/summarize/batch",
+            "progress": "/progress/{content_hash}",
+            "summary": "/summary/{content_hash}",
+            "download_report": "/download/{content_hash}/report.md"
         }
     }
 
 
+class StageTimer:
+    """Measure consecutive processing stages with perf_counter."""
+
+    def __init__(self):
+        self.started = self._last = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def mark(self, stage: str) -> None:
+        """Record the time since the previous mark as the given stage."""
+        now = time.perf_counter()
+        self.stages[stage] = now - self._last
+        self._last = now
+        if STAGE_SECONDS is not None:
+            STAGE_SECONDS.labels(stage).observe(self.stages[stage])
+
+    @property
+    def total(self) -> float:
+        """Seconds since the timer was created."""
+        return time.perf_counter() - self.started
+
+
+def _count_cache_lookup(kind: str, hit: bool) -> None:
+    """Count a result cache lookup for the hit ratio metric."""
+    if RESULT_CACHE_LOOKUPS is not None:
+        RESULT_CACHE_LOOKUPS.labels(kind, "hit" if hit else "miss").inc()
+
+
 async def validate_file_size(file: UploadFile) -> None:
     """Validate file size before processing."""
     if file.size and file.size > MAX_FILE_SIZE_BYTES:
@@ -78,88 +243,290 @@ async def validate_file_size(file: UploadFile) -> None:
             detail=f"File too large. Maximum size allowed: {MAX_FILE_SIZE_MB}MB"
         )
 
+
+def _is_mpeg_ts(head: bytes) -> bool:
+    """Recognize MPEG-TS (.ts) and BDAV (.mts/.m2ts) streams, which filetype misses."""
+    for offset, packet_size in ((0, TS_PACKET_SIZE), (4, TS_PACKET_SIZE + 4)):
+        sync_positions = range(offset, len(head), packet_size)
+        if len(sync_positions) >= TS_MIN_PACKETS and all(
+            head[position] == TS_SYNC_BYTE for position in sync_positions
+        ):
+            return True
+    return False
+
+
+async def is_video_upload(file: UploadFile) -> bool:
+    """Check the file's magic bytes for a known video container."""
+    head = await file.read(VIDEO_SNIFF_BYTES)
+    await file.seek(0)
+    return filetype.video_match(head) is not None or _is_mpeg_ts(head)
+
+
+def _spooled_fileno(file: UploadFile) -> Optional[int]:
+    """File descriptor of an upload Starlette has spooled to disk, if any."""
+    # fileno() would force an in-memory SpooledTemporaryFile onto disk
+    if not getattr(file.file, "_rolled", False):
+        return None
+    try:
+        return file.file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _copy_file_range(src_fd: int, destination: Path) -> bool:
+    """Copy a whole file inside the kernel; False if the filesystem can't."""
+    try:
+        with open(destination, 'wb') as f:
+            offset = 0
+            while copied := os.copy_file_range(src_fd, f.fileno(), COPY_RANGE_SIZE, offset):
+                offset += copied
+        return True
+    except OSError:
+        return False
+
+
+def _content_hasher() -> "hashlib.blake2b":
+    """Hash used to key cached results by video content."""
+    return hashlib.blake2b(digest_size=32)
+
+
+def _file_digest(path: Path) -> str:
+    """Content hash of a file on disk."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, _content_hasher).hexdigest()
+
+
+async def save_upload(file: UploadFile, destination: Path) -> str:
+    """
+    Write an uploaded file to disk and return its content hash.
+
+    Uploads already spooled to a temporary file are copied kernel-side with
+    copy_file_range (a reflink on CoW filesystems); small in-memory uploads and
+    platforms without it fall back to fixed-size chunks, hashed as they stream.
+    """
+    src_fd = _spooled_fileno(file)
+    if src_fd is not None and hasattr(os, "copy_file_range"):
+        if await asyncio.to_thread(_copy_file_range, src_fd, destination):
+            return await asyncio.to_thread(_file_digest, destination)
+
+    hasher = _content_hasher()
+    await file.seek(0)
+    async with aiofiles.open(destination, 'wb') as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            await f.write(chunk)
+    return hasher.hexdigest()
+
+
+async def prepare_audio(
+    video_path: Path,
+    transcription_service: TranscriptionService,
+    remove_silence: bool = True
+) -> Tuple[AudioInput, float]:
+    """
+    Extract the audio to transcribe, returning it with its duration in seconds.
+
+    The local backend reads samples from memory and skips silence with its own
+    VAD, so its audio is decoded straight into an array without a WAV file.
+    """
+    if transcription_service.removes_silence:
+        samples = await video_processor.extract_audio_pcm(video_path)
+        return samples, len(samples) / SAMPLE_RATE
+
+    if remove_silence:
+        audio_path = await video_processor.extract_audio_with_silence_removal(video_path)
+    else:
+        audio_path = await video_processor.extract_audio(video_path)
+    return audio_path, await video_processor._get_audio_duration(audio_path)
+
+
+async def cached_transcript(
+    content_hash: str,
+    audio: AudioInput,
+    transcription_service: TranscriptionService,
+    scratch_dir: Path
+) -> str:
+    """Transcribe audio unless a video with the same content was seen before."""
+    key = f"transcript:{content_hash}"
+    transcript = await result_cache.get(key)
+    _count_cache_lookup("transcript", transcript is not None)
+    if transcript is None:
+        transcript = await transcribe_long_audio(
+            content_hash, audio, transcription_service, scratch_dir
+        )
+        await result_cache.set(key, transcript)
+    return transcript
+
+
+async def transcribe_long_audio(
+    content_hash: str,
+    audio: AudioInput,
+    transcription_service: TranscriptionService,
+    scratch_dir: Path
+) -> str:
+    """Split long audio at pauses in speech and transcribe the chunks in parallel.
+
+    Chunk files are written to scratch_dir, the request's leased scratch slot.
+    """
+    if transcription_service.removes_silence or not isinstance(audio, Path):
+        # The local model is a single worker; chunking would only queue on it
+        return await transcription_service.transcribe_audio(audio)
+
+    chunks = await video_processor.chunk_audio_vad(audio)
+    if len(chunks) == 1:
+        return await transcription_service.transcribe_audio(audio)
+
+    chunk_dir = scratch_dir / "chunks"
+    chunk_dir.mkdir(exist_ok=True)
+    chunk_paths = await video_processor.split_audio(audio, chunks, chunk_dir)
+    record_progress(content_hash, "transcribe", 0, len(chunk_paths))
+    return await transcription_service.transcribe_chunks(
+        chunk_paths,
+        lambda completed, total: record_progress(content_hash, "transcribe", completed, total)
+    )
+
+
+def record_progress(content_hash: str, stage: str, completed: int, total: int) -> None:
+    """Keep a progress event for GET /progress and append it to PROGRESS_EVENTS_PATH."""
+    transcription_progress[content_hash] = {
+        "stage": stage,
+        "completed": completed,
+        "total": total
+    }
+    transcription_progress.move_to_end(content_hash)
+    while len(transcription_progress) > PROGRESS_MAX_ENTRIES:
+        transcription_progress.popitem(last=False)
+
+    if not PROGRESS_EVENTS_PATH:
+        return
+    event = {
+        "video": content_hash,
+        "stage": stage,
+        "completed": completed,
+        "total": total,
+        "time": time.time()
+    }
+    with open(PROGRESS_EVENTS_PATH, 'a') as f:
+        f.write(json.dumps(event) + "\n")
+
+
+@app.get("/progress/{content_hash}", response_model=ProgressStatus)
+async def get_progress(content_hash: str) -> ProgressStatus:
+    """
+    Get the transcription progress of a video being processed.
+    
+    Args:
+        content_hash: BLAKE2b-256 hex digest of the uploaded file
+        
+    Returns:
+        ProgressStatus with chunks completed out of the total
+    """
+    progress = transcription_progress.get(content_hash)
+    if progress is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No progress recorded for this hash"
+        )
+    return ProgressStatus(content_hash=content_hash, **progress)
+
+
+async def cached_summary(
+    content_hash: str,
+    transcript: str,
+    summarization_service: SummarizationService
+) -> str:
+    """Summarize a transcript unless the same video was summarized before."""
+    key = f"summary:{content_hash}"
+    summary = await result_cache.get(key)
+    _count_cache_lookup("summary", summary is not None)
+    if summary is None:
+        summary = await summarization_service.generate_summary(transcript)
+        await result_cache.set(key, summary)
+    return summary
+
+
+async def summarize_in_background(
+    content_hash: str,
+    transcript: str,
+    summarization_service: SummarizationService
+) -> None:
+    """Generate and cache a summary after the response has been sent."""
+    try:
+        await cached_summary(content_hash, transcript, summarization_service)
+    except Exception as e:
+        await result_cache.set(f"summary_error:{content_hash}", str(e))
+
+
 @app.post("/upload-video", response_model=ProcessingResult)
 async def upload_and_process_video(
-    file: UploadFile = File(...)
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    defer_summary: bool = False,
+    transcription_service: TranscriptionService = Depends(get_transcription_service),
+    summarization_service: SummarizationService = Depends(get_summarization_service),
+    scratch_pool: ScratchPool = Depends(get_scratch_pool)
 ) -> ProcessingResult:
     """
     Upload a video file and process it to extract transcript and summary.
     
     Args:
         file: Uploaded video file
+        defer_summary: Return once transcribed; poll summary_url for the summary
         
     Returns:
         ProcessingResult with transcript, summary, and metadata
     """
+    timer = StageTimer()
+    
     # Validate file size
     await validate_file_size(file)
     
-    # Validate file type
-    if not file.content_type or not file.content_type.startswith('video/'):
+    # Validate file type from its magic bytes; the client's content type is a guess
+    if not await is_video_upload(file):
         raise HTTPException(
             status_code=400,
             detail="File must be a video format"
         )
     
-    # Create temporary directory for processing
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
+    # Borrow a preallocated scratch directory; it is emptied when returned
+    async with scratch_pool.lease() as temp_path:
         
         # Save uploaded file
         video_path = temp_path / f"input_{file.filename}"
-        async with aiofiles.open(video_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
-        
-        try:
-            # Get video metadata first
-            video_info = await video_processor.get_video_info(video_path)
-            
-            # Extract audio with silence removal for efficient processing
-            audio_path = await video_processor.extract_audio_with_silence_removal(video_path)
-            
-            # Get optimized audio duration
-            optimized_duration = await video_processor._get_audio_duration(audio_path)
-            
-            # Calculate silence removal efficiency
-            original_duration = video_info.get("duration", 0.0)
-            silence_removed_percent = 0.0
-            if original_duration > 0:
-                silence_removed_percent = ((original_duration - optimized_duration) / original_duration) * 100
-            
-            # Transcribe optimized audio (much faster!)
-            transcript = await transcription_service.transcribe_audio(audio_path)
-            
-            # Generate summary
-            summary = await summarization_service.generate_summary(transcript)
-            
-            return ProcessingResult(
-                transcript=transcript,
-                summary=summary,
-                processing_time=0.0,  # TODO: Add timing
-                video_duration=original_duration,
-                optimized_duration=optimized_duration,
-                silence_removed_percent=silence_removed_percent
-            )
-            
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error processing video: {str(e)}"
-            )
+        content_hash = await save_upload(file, video_path)
+        timer.mark("save")
+        
+        return await _run_pipeline(
+            video_path,
+            transcription_service,
+            summarization_service,
+            timer,
+            temp_path,
+            content_hash=content_hash,
+            background_tasks=background_tasks if defer_summary else None
+        )
 
 
 @app.post("/process-video")
-async def process_existing_video(video_path: str) -> ProcessingResult:
+async def process_existing_video(
+    video_path: str,
+    background_tasks: BackgroundTasks,
+    defer_summary: bool = False,
+    transcription_service: TranscriptionService = Depends(get_transcription_service),
+    summarization_service: SummarizationService = Depends(get_summarization_service),
+    scratch_pool: ScratchPool = Depends(get_scratch_pool)
+) -> ProcessingResult:
     """
     Process an existing video file by path.
     
     Args:
         video_path: Path to the video file
+        defer_summary: Return once transcribed; poll summary_url for the summary
         
     Returns:
         ProcessingResult with transcript, summary, and metadata
     """
+    timer = StageTimer()
     video_file = Path(video_path)
     
     if not video_file.exists():
@@ -168,24 +535,93 @@ async def process_existing_video(video_path: str) -> ProcessingResult:
             detail=f"Video file not found: {video_path}"
         )
     
+    async with scratch_pool.lease() as scratch_dir:
+        return await _run_pipeline(
+            video_file,
+            transcription_service,
+            summarization_service,
+            timer,
+            scratch_dir,
+            remove_silence=False,
+            background_tasks=background_tasks if defer_summary else None
+        )
+
+
+async def _run_pipeline(
+    video_path: Path,
+    transcription_service: TranscriptionService,
+    summarization_service: SummarizationService,
+    timer: StageTimer,
+    scratch_dir: Path,
+    content_hash: Optional[str] = None,
+    remove_silence: bool = True,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> ProcessingResult:
+    """
+    Extract, transcribe and summarize a video on disk.
+    
+    Args:
+        video_path: Path to the video file
+        transcription_service: Service used for the transcript
+        summarization_service: Service used for the summary
+        timer: Stage timer started when the request arrived
+        scratch_dir: Leased scratch slot for intermediate files
+        content_hash: Content hash of the file; computed here when omitted
+        remove_silence: Cut silence out of the audio before transcribing
+        background_tasks: When given, summarize after responding instead of inline
+        
+    Returns:
+        ProcessingResult with transcript, summary, and metadata
+    """
     try:
-        # Extract audio from video
-        audio_path = await video_processor.extract_audio(video_file)
+        # Extract audio, probing metadata (and hashing the file if needed)
+        # while the audio is being extracted
+        steps = [
+            prepare_audio(video_path, transcription_service, remove_silence),
+            video_processor.get_video_info(video_path)
+        ]
+        if content_hash is None:
+            steps.append(asyncio.to_thread(_file_digest, video_path))
+        (audio, optimized_duration), video_info, *digest = await asyncio.gather(*steps)
+        content_hash = content_hash or digest[0]
+        timer.mark("extract")
         
-        # Get video metadata
-        video_info = await video_processor.get_video_info(video_file)
+        # Calculate silence removal efficiency
+        original_duration = video_info.get("duration", 0.0)
+        silence_removed_percent = 0.0
+        if original_duration > 0:
+            silence_removed_percent = ((original_duration - optimized_duration) / original_duration) * 100
         
-        # Transcribe audio
-        transcript = await transcription_service.transcribe_audio(audio_path)
+        # Transcribe optimized audio (much faster!)
+        transcript = await cached_transcript(
+            content_hash, audio, transcription_service, scratch_dir
+        )
+        timer.mark("transcribe")
         
-        # Generate summary
-        summary = await summarization_service.generate_summary(transcript)
+        # Generate summary, or leave it to run once the transcript is sent
+        summary = ""
+        summary_url = None
+        if background_tasks is not None:
+            # Forget an earlier failure so pollers see this attempt as pending
+            await result_cache.delete(f"summary_error:{content_hash}")
+            background_tasks.add_task(
+                summarize_in_background, content_hash, transcript, summarization_service
+            )
+            summary_url = f"/summary/{content_hash}"
+        else:
+            summary = await cached_summary(content_hash, transcript, summarization_service)
+            timer.mark("summarize")
         
         return ProcessingResult(
             transcript=transcript,
             summary=summary,
-            processing_time=0.0,  # TODO: Add timing
-            video_duration=video_info.get("duration", 0.0)
+            processing_time=timer.total,
+            video_duration=original_duration,
+            optimized_duration=optimized_duration,
+            silence_removed_percent=silence_removed_percent,
+            stage_times=timer.stages,
+            content_hash=content_hash,
+            summary_url=summary_url
         )
         
     except Exception as e:
@@ -195,6 +631,128 @@ async def process_existing_video(video_path: str) -> ProcessingResult:
         )
 
 
+@app.get("/summary/{content_hash}", response_model=SummaryResult)
+async def get_summary(content_hash: str) -> SummaryResult:
+    """
+    Get the summary of a video processed with defer_summary.
+    
+    Args:
+        content_hash: content_hash returned with the transcript
+        
+    Returns:
+        SummaryResult; status stays "pending" until the summary is cached
+    """
+    summary = await result_cache.get(f"summary:{content_hash}")
+    if summary is not None:
+        return SummaryResult(content_hash=content_hash, status="completed", summary=summary)
+    
+    error = await result_cache.get(f"summary_error:{content_hash}")
+    if error is not None:
+        return SummaryResult(content_hash=content_hash, status="failed", error=error)
+    
+    if await result_cache.get(f"transcript:{content_hash}") is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No processed video found for this hash"
+        )
+    return SummaryResult(content_hash=content_hash, status="pending")
+
+
+async def iter_report(name: str, summary: str, transcript: str) -> AsyncIterator[str]:
+    """Yield a markdown report, sending the transcript in fixed-size pieces."""
+    yield f"# Video Analysis Report: {name}\n\n## Summary\n{summary}\n\n## Full Transcript\n"
+    for start in range(0, len(transcript), REPORT_CHUNK_CHARS):
+        yield transcript[start:start + REPORT_CHUNK_CHARS]
+    yield "\n\n---\nGenerated by Video Extractor\n"
+
+
+@app.get("/download/{content_hash}/report.md")
+async def download_report(content_hash: str, name: str = "video") -> StreamingResponse:
+    """
+    Stream the markdown report of a processed video.
+    
+    Args:
+        content_hash: content_hash returned by /upload-video or /process-video
+        name: Video name used in the report title and file name
+        
+    Returns:
+        StreamingResponse with the summary followed by the full transcript
+    """
+    transcript = await result_cache.get(f"transcript:{content_hash}")
+    if transcript is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No processed video found for this hash"
+        )
+    summary = await result_cache.get(f"summary:{content_hash}") or ""
+    
+    return StreamingResponse(
+        iter_report(name, summary, transcript),
+        media_type="text/markdown",
+        headers={
+            "Content-Disposition": f"attachment; filename*=utf-8''{quote(name)}_complete_report.md"
+        }
+    )
+
+
+@app.post("/api/summarize/batch", response_model=BatchSummaryStatus)
+async def submit_batch_summary(
+    request: BatchSummaryRequest,
+    summarization_service: SummarizationService = Depends(get_summarization_service)
+) -> BatchSummaryStatus:
+    """
+    Queue transcripts for offline summarization at batch pricing.
+    
+    Args:
+        request: Transcripts keyed by ID and the summary type
+        
+    Returns:
+        BatchSummaryStatus to poll via GET /api/summarize/batch/{batch_id}
+    """
+    if not request.transcripts:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one transcript is required"
+        )
+    
+    try:
+        batch = await summarization_service.submit_batch(
+            request.transcripts, request.summary_type
+        )
+        return BatchSummaryStatus(id=batch["id"], status=batch["status"])
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error submitting batch: {str(e)}"
+        )
+
+
+@app.get("/api/summarize/batch/{batch_id}", response_model=BatchSummaryStatus)
+async def get_batch_summary(
+    batch_id: str,
+    summarization_service: SummarizationService = Depends(get_summarization_service)
+) -> BatchSummaryStatus:
+    """
+    Get the status of a batch summarization job and its results when completed.
+    
+    Args:
+        batch_id: ID returned when the batch was submitted
+        
+    Returns:
+        BatchSummaryStatus with summaries keyed by transcript ID
+    """
+    try:
+        result = await summarization_service.get_batch_results(batch_id)
+        return BatchSummaryStatus(**result)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error retrieving batch: {str(e)}"
+        )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,9 +1,14 @@
 """Streamlit frontend for Video Extractor application."""
 
+import hashlib
 import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 import streamlit as st
-import requests
+import httpx
 from typing import Optional, Dict, Any
+from urllib.parse import quote
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -23,35 +28,55 @@ MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "2000"))  # 2GB default
 
 # API Configuration - for demo purposes, we'll simulate the API
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+# API address as seen from users' browsers, for direct report downloads;
+# API_BASE_URL is only reachable from this server
+PUBLIC_API_URL = os.getenv("PUBLIC_API_URL")
 DEMO_MODE = True  # Enable demo mode for Streamlit Cloud deployment
 
+# Processing results kept per browser session, keyed by upload
+MAX_SESSION_RESULTS = int(os.getenv("MAX_SESSION_RESULTS", "5"))
+# Seconds between checks for a summary generated after the transcript
+SUMMARY_POLL_INTERVAL_S = float(os.getenv("SUMMARY_POLL_INTERVAL_S", "2"))
+# Seconds between transcription progress checks while a video is processed
+PROGRESS_POLL_INTERVAL_S = 1.0
+
+@st.cache_resource
+def get_api_client() -> httpx.Client:
+    """HTTP client shared across reruns and sessions, so connections are reused."""
+    return httpx.Client(base_url=API_BASE_URL)
+
+@st.cache_data(ttl=10, show_spinner=False)
 def check_api_health() -> bool:
-    """Check if the FastAPI backend is running."""
+    """Check if the FastAPI backend is running; cached since every rerun asks."""
     if DEMO_MODE:
         return False  # API not available in demo mode
     try:
-        response = requests.get(f"{API_BASE_URL}/healthz", timeout=5)
+        response = get_api_client().get("/healthz", timeout=5)
         return response.status_code == 200
-    except requests.exceptions.RequestException:
+    except httpx.HTTPError:
+        return False
+
+@st.cache_data(ttl=10, show_spinner=False)
+def report_available(content_hash: str) -> bool:
+    """Whether the API can still serve this video's report from its result cache."""
+    try:
+        with get_api_client().stream("GET", f"/download/{content_hash}/report.md", timeout=5) as response:
+            return response.status_code == 200
+    except httpx.HTTPError:
         return False
 
 def simulate_video_processing(video_file) -> Dict[str, Any]:
     """Simulate video processing for demo mode."""
-    import time
-    
-    # Simulate processing time
+    # One update per stage; the results are canned, so there is nothing to wait for
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i in range(100):
-        progress_bar.progress(i + 1)
-        if i < 30:
-            status_text.text("🎵 Extracting audio...")
-        elif i < 70:
-            status_text.text("🗣️ Transcribing speech...")
-        else:
-            status_text.text("🤖 Generating summary...")
-        time.sleep(0.05)
+    status_text.text("🎵 Extracting audio...")
+    progress_bar.progress(33)
+    status_text.text("🗣️ Transcribing speech...")
+    progress_bar.progress(66)
+    status_text.text("🤖 Generating summary...")
+    progress_bar.progress(100)
     
     # Return simulated results
     sample_transcript = """Welcome to our video presentation. Today we'll be discussing the importance of artificial intelligence in modern business applications. 
@@ -94,14 +119,27 @@ def upload_and_process_video(video_file) -> Optional[Dict[str, Any]]:
         return simulate_video_processing(video_file)
     
     try:
-        files = {"file": (video_file.name, video_file.read(), video_file.type)}
+        # Pass the file object itself: httpx streams it into the multipart
+        # body instead of holding a second copy of the video in memory
+        video_file.seek(0)
+        files = {"file": (video_file.name, video_file, video_file.type)}
         
-        with st.spinner("Processing video... This may take a few minutes."):
-            response = requests.post(
-                f"{API_BASE_URL}/upload-video",
+        # The API reports progress under the same hash of the file's content
+        content_hash = hashlib.file_digest(
+            video_file, lambda: hashlib.blake2b(digest_size=32)
+        ).hexdigest()
+        video_file.seek(0)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Get the transcript back first; the summary is polled separately
+            request = executor.submit(
+                get_api_client().post,
+                "/upload-video",
                 files=files,
+                params={"defer_summary": "true"},
                 timeout=300  # 5 minutes timeout
             )
+            response = wait_with_progress(request, content_hash)
         
         if response.status_code == 200:
             return response.json()
@@ -109,13 +147,102 @@ def upload_and_process_video(video_file) -> Optional[Dict[str, Any]]:
             st.error(f"API Error: {response.status_code} - {response.text}")
             return None
             
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         st.error("Request timed out. The video might be too long or the server is busy.")
         return None
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         st.error(f"Network error: {str(e)}")
         return None
 
+def wait_with_progress(request: Future, content_hash: str) -> httpx.Response:
+    """Show the API's transcription progress until the upload request finishes."""
+    progress_bar = st.progress(0, text="Processing video... This may take a few minutes.")
+    while True:
+        try:
+            return request.result(timeout=PROGRESS_POLL_INTERVAL_S)
+        except TimeoutError:
+            pass
+        
+        try:
+            response = get_api_client().get(f"/progress/{content_hash}", timeout=5)
+        except httpx.HTTPError:
+            continue
+        if response.status_code == 200:
+            progress = response.json()
+            progress_bar.progress(
+                progress['completed'] / max(progress['total'], 1),
+                text=f"🗣️ Transcribing... {progress['completed']}/{progress['total']} chunks"
+            )
+
+def fetch_deferred_summary(result: Dict[str, Any]) -> Optional[str]:
+    """Fetch a summary generated after the transcript was returned, once it is ready."""
+    try:
+        response = get_api_client().get(result['summary_url'], timeout=10)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        st.error(f"Could not fetch summary: {str(e)}")
+        return None
+    
+    data = response.json()
+    if data['status'] == "failed":
+        result['summary_error'] = data.get('error') or "unknown error"
+    if data['status'] != "completed":
+        return None
+    result['summary'] = data['summary']
+    return data['summary']
+
+@st.fragment(run_every=SUMMARY_POLL_INTERVAL_S)
+def poll_deferred_summary(result: Dict[str, Any]) -> None:
+    """Re-check a pending summary every few seconds until it arrives or fails."""
+    if fetch_deferred_summary(result) is not None or result.get('summary_error'):
+        # Rerun the whole page so the downloads pick the summary up too
+        st.rerun()
+    st.info("⏳ The summary is still being generated.")
+
+def store_result(key: str, result: Dict[str, Any]) -> None:
+    """Keep a result in the session, evicting the least recently used past the cap."""
+    results = st.session_state.setdefault('results_cache', OrderedDict())
+    results[key] = result
+    results.move_to_end(key)
+    while len(results) > MAX_SESSION_RESULTS:
+        results.popitem(last=False)
+    st.session_state['current_result'] = key
+
+def get_stored_result(key: str) -> Optional[Dict[str, Any]]:
+    """Look up a stored result, marking it as recently used."""
+    results = st.session_state.get('results_cache', {})
+    if key not in results:
+        return None
+    results.move_to_end(key)
+    return results[key]
+
+def get_current_result() -> Optional[Dict[str, Any]]:
+    """Result of the most recently processed video, if it is still stored."""
+    return st.session_state.get('results_cache', {}).get(st.session_state.get('current_result'))
+
+@st.cache_data(max_entries=MAX_SESSION_RESULTS, show_spinner=False)
+def build_report(
+    video_name: str,
+    summary: str,
+    transcript: str,
+    processing_time: float,
+    video_duration: float
+) -> str:
+    """Assemble the markdown report once per result instead of on every rerun."""
+    return f"""# Video Analysis Report: {video_name}
+
+## Summary
+{summary}
+
+## Full Transcript
+{transcript}
+
+---
+Generated by Video Extractor
+Processing Time: {processing_time:.1f}s
+Video Duration: {video_duration:.1f}s
+"""
+
 def main():
     """Main Streamlit application."""
     
@@ -202,17 +329,20 @@ def main():
             
             # Process button
             if st.button("🚀 Process Video", type="primary", use_container_width=True):
-                # Reset file pointer
-                uploaded_file.seek(0)
-                
-                # Process the video
-                result = upload_and_process_video(uploaded_file)
+                # Reuse the result if this upload was processed recently
+                result = get_stored_result(uploaded_file.file_id)
+                if result is None:
+                    # Reset file pointer
+                    uploaded_file.seek(0)
+                    
+                    # Process the video
+                    result = upload_and_process_video(uploaded_file)
                 
                 if result:
                     st.success("✅ Video processed successfully!")
                     
                     # Store results in session state
-                    st.session_state['processing_result'] = result
+                    store_result(uploaded_file.file_id, result)
                     st.session_state['video_name'] = Path(uploaded_file.name).stem
                     
                     # Trigger rerun to show results
@@ -221,9 +351,8 @@ def main():
     with col2:
         st.header("📈 Processing Stats")
         
-        if 'processing_result' in st.session_state:
-            result = st.session_state['processing_result']
-            
+        result = get_current_result()
+        if result is not None:
             # Display metrics
             col_stat1, col_stat2 = st.columns(2)
             with col_stat1:
@@ -265,10 +394,10 @@ def main():
             st.info("Upload a video to see processing statistics")
     
     # Results section
-    if 'processing_result' in st.session_state:
+    result = get_current_result()
+    if result is not None:
         st.header("📋 Results")
         
-        result = st.session_state['processing_result']
         video_name = st.session_state.get('video_name', 'video')
         
         # Create tabs for different outputs
@@ -276,8 +405,14 @@ def main():
         
         with tab1:
             st.subheader("🤖 AI-Generated Summary")
-            summary = result.get('summary', 'No summary available')
-            st.markdown(summary)
+            if result.get('summary'):
+                st.markdown(result['summary'])
+            elif result.get('summary_error'):
+                st.error(f"Summary generation failed: {result['summary_error']}")
+            elif result.get('summary_url'):
+                poll_deferred_summary(result)
+            else:
+                st.markdown('No summary available')
             
             # Copy button for summary
             if st.button("📋 Copy Summary", key="copy_summary"):
@@ -323,28 +458,31 @@ def main():
                     use_container_width=True
                 )
             
-            # Download combined report
-            combined_content = f"""# Video Analysis Report: {video_name}
-
-## Summary
-{summary_content}
-
-## Full Transcript
-{transcript_content}
-
----
-Generated by Video Extractor
-Processing Time: {result.get('processing_time', 0):.1f}s
-Video Duration: {result.get('video_duration', 0):.1f}s
-"""
-            
-            st.download_button(
-                label="📊 Download Complete Report",
-                data=combined_content,
-                file_name=f"{video_name}_complete_report.md",
-                mime="text/markdown",
-                use_container_width=True
-            )
+            # Download combined report; when the browser can reach the API and
+            # it still has the result, it streams the report so it is never
+            # assembled in this session
+            content_hash = result.get('content_hash')
+            if PUBLIC_API_URL and content_hash and report_available(content_hash):
+                st.link_button(
+                    label="📊 Download Complete Report",
+                    url=f"{PUBLIC_API_URL}/download/{content_hash}/report.md?name={quote(video_name)}",
+                    use_container_width=True
+                )
+            else:
+                combined_content = build_report(
+                    video_name,
+                    summary_content,
+                    transcript_content,
+                    result.get('processing_time', 0),
+                    result.get('video_duration', 0)
+                )
+                st.download_button(
+                    label="📊 Download Complete Report",
+                    data=combined_content,
+                    file_name=f"{video_name}_complete_report.md",
+                    mime="text/markdown",
+                    use_container_width=True
+                )
     
     # Footer
     st.markdown("---")
@@ -1,24 +1,83 @@
 """Tests for the FastAPI application."""
 
+import os
+from types import SimpleNamespace
+
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
 from src.app.web import app
 
-client = TestClient(app)
+# One event loop for the module, so the app's lifespan runs once for all tests
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """Client calling the ASGI app in-process, with its lifespan running."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY", "sk-test"))
+        async with app.router.lifespan_context(app):
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                yield client
+
+
+@pytest.fixture
+def stubbed_pipeline(monkeypatch):
+    """App with extraction, transcription and summarization stubbed out.
+
+    Yields the namespace the stubs read their transcript and summary from;
+    set summary to an exception to make summarization fail, or to a
+    coroutine function to control when it finishes.
+    """
+    from src.app import web
 
+    stubs = SimpleNamespace(transcript="A transcript", summary="A summary")
 
-def test_health_check():
+    async def extract_audio(video_path):
+        return video_path
+
+    async def get_video_info(video_path):
+        return {"duration": 12.0}
+
+    async def transcribe_long_audio(content_hash, audio_path, transcription_service, scratch_dir):
+        return stubs.transcript
+
+    async def generate_summary(transcript):
+        if isinstance(stubs.summary, Exception):
+            raise stubs.summary
+        if callable(stubs.summary):
+            return await stubs.summary()
+        return stubs.summary
+
+    monkeypatch.setattr(web.video_processor, "extract_audio", extract_audio)
+    monkeypatch.setattr(web.video_processor, "get_video_info", get_video_info)
+    monkeypatch.setattr(web, "transcribe_long_audio", transcribe_long_audio)
+    app.dependency_overrides[web.get_transcription_service] = lambda: SimpleNamespace(
+        removes_silence=False
+    )
+    app.dependency_overrides[web.get_summarization_service] = lambda: SimpleNamespace(
+        generate_summary=generate_summary
+    )
+    try:
+        yield stubs
+    finally:
+        app.dependency_overrides.clear()
+
+
+async def test_health_check(client):
     """Test the health check endpoint."""
-    response = client.get("/healthz")
+    response = await client.get("/healthz")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
     assert data["service"] == "video-extractor"
 
 
-def test_root_endpoint():
+async def test_root_endpoint(client):
     """Test the root endpoint."""
-    response = client.get("/")
+    response = await client.get("/")
     assert response.status_code == 200
     data = response.json()
     assert "message" in data
@@ -26,27 +85,33 @@ def test_root_endpoint():
     assert "endpoints" in data
 
 
-def test_upload_video_no_file():
+async def test_upload_video_no_file(client):
     """Test upload endpoint with no file."""
-    response = client.post("/upload-video")
+    response = await client.post("/upload-video")
     assert response.status_code == 422  # Unprocessable Entity
 
 
-def test_upload_video_invalid_file():
+async def test_upload_video_invalid_file(client):
     """Test upload endpoint with invalid file type."""
     files = {"file": ("test.txt", b"test content", "text/plain")}
-    response = client.post("/upload-video", files=files)
+    response = await client.post("/upload-video", files=files)
     assert response.status_code == 400
     assert "File must be a video format" in response.json()["detail"]
 
 
-def test_process_video_not_found():
+async def test_process_video_not_found(client):
     """Test process endpoint with non-existent file."""
-    response = client.post("/process-video", json={"video_path": "/nonexistent/file.mp4"})
+    response = await client.post("/process-video", json={"video_path": "/nonexistent/file.mp4"})
     assert response.status_code == 422  # Due to JSON body vs query param mismatch
 
 
-@pytest.mark.asyncio
+async def test_batch_summary_requires_transcripts(client):
+    """Test batch summarization endpoint with no transcripts."""
+    response = await client.post("/api/summarize/batch", json={"transcripts": {}})
+    assert response.status_code == 400
+    assert "At least one transcript" in response.json()["detail"]
+
+
 async def test_video_processor_import():
     """Test that video processor can be imported."""
     from src.app.services.video_processor import VideoProcessor
@@ -54,7 +119,6 @@ async def test_video_processor_import():
     assert processor is not None
 
 
-@pytest.mark.asyncio
 async def test_transcription_service_import():
     """Test that transcription service can be imported (without API key)."""
     try:
@@ -66,7 +130,6 @@ async def test_transcription_service_import():
         assert "OPENAI_API_KEY" in str(e)
 
 
-@pytest.mark.asyncio
 async def test_summarization_service_import():
     """Test that summarization service can be imported (without API key)."""
     try:
@@ -76,3 +139,217 @@ async def test_summarization_service_import():
     except ValueError as e:
         # Expected when OPENAI_API_KEY is not set
         assert "OPENAI_API_KEY" in str(e)
+
+
+async def test_lifespan_shares_one_openai_client(client):
+    """Services built at startup reuse a single client for the app's lifetime."""
+    assert (await client.get("/healthz")).status_code == 200
+    state = app.state
+    assert state.summarization_service.client is state.openai_client
+    if not state.transcription_service.removes_silence:
+        assert state.transcription_service.client is state.openai_client
+
+
+async def test_save_upload_streams_in_chunks(tmp_path):
+    """Uploads larger than one chunk are written to disk intact."""
+    import io
+
+    from fastapi import UploadFile
+    from src.app.web import UPLOAD_CHUNK_SIZE, _file_digest, save_upload
+
+    payload = bytes(range(256)) * (UPLOAD_CHUNK_SIZE // 100)
+    destination = tmp_path / "upload.mp4"
+
+    digest = await save_upload(UploadFile(io.BytesIO(payload), filename="clip.mp4"), destination)
+
+    assert destination.read_bytes() == payload
+    assert digest == _file_digest(destination)
+
+
+async def test_save_upload_copies_spooled_file(tmp_path):
+    """Uploads Starlette spooled to disk are copied without a userspace buffer."""
+    from tempfile import SpooledTemporaryFile
+
+    from fastapi import UploadFile
+    from src.app.web import _file_digest, save_upload
+
+    payload = b"frame" * 1000
+    spooled = SpooledTemporaryFile(max_size=16)
+    spooled.write(payload)
+    destination = tmp_path / "upload.mp4"
+
+    digest = await save_upload(UploadFile(spooled, filename="clip.mp4"), destination)
+
+    assert spooled._rolled
+    assert destination.read_bytes() == payload
+    assert digest == _file_digest(destination)
+
+
+async def test_process_video_reports_stage_times(client, stubbed_pipeline, tmp_path):
+    """Each pipeline stage is timed and the total is reported as processing_time."""
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"stage timing test video")
+
+    response = await client.post("/process-video", params={"video_path": str(video_path)})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["summary"] == "A summary"
+    assert set(data["stage_times"]) == {"extract", "transcribe", "summarize"}
+    assert data["processing_time"] >= sum(data["stage_times"].values())
+
+    report = await client.get(f"/download/{data['content_hash']}/report.md", params={"name": "clip"})
+    assert report.status_code == 200
+    assert report.headers["content-type"].startswith("text/markdown")
+    assert report.text.startswith("# Video Analysis Report: clip")
+    assert "## Summary\nA summary" in report.text
+    assert "A transcript" in report.text
+
+
+async def test_deferred_summary_is_polled_after_response(client, stubbed_pipeline, tmp_path):
+    """With defer_summary the transcript comes back first and the summary is fetched later."""
+    stubbed_pipeline.transcript = "A deferred transcript"
+    stubbed_pipeline.summary = "A deferred summary"
+    video_path = tmp_path / "deferred.mp4"
+    video_path.write_bytes(b"deferred summary test video")
+
+    response = await client.post(
+        "/process-video",
+        params={"video_path": str(video_path), "defer_summary": True}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["transcript"] == "A deferred transcript"
+    assert data["summary"] == ""
+    assert "summarize" not in data["stage_times"]
+    assert data["summary_url"] == f"/summary/{data['content_hash']}"
+
+    summary = await client.get(data["summary_url"])
+    assert summary.status_code == 200
+    assert summary.json()["status"] == "completed"
+    assert summary.json()["summary"] == "A deferred summary"
+
+
+async def test_retried_summary_is_pending_not_failed(client, stubbed_pipeline, tmp_path):
+    """Reprocessing a video whose summary failed clears the old failure."""
+    import asyncio
+
+    video_path = tmp_path / "retry.mp4"
+    video_path.write_bytes(b"retried summary test video")
+    params = {"video_path": str(video_path), "defer_summary": True}
+
+    stubbed_pipeline.summary = RuntimeError("model overloaded")
+    response = await client.post("/process-video", params=params)
+    summary_url = response.json()["summary_url"]
+    failed = await client.get(summary_url)
+    assert failed.json()["status"] == "failed"
+    assert "model overloaded" in failed.json()["error"]
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_summary():
+        started.set()
+        await release.wait()
+        return "A retried summary"
+
+    stubbed_pipeline.summary = slow_summary
+    retry = asyncio.create_task(client.post("/process-video", params=params))
+    await asyncio.wait_for(started.wait(), 5)
+    in_flight = await client.get(summary_url)
+    release.set()
+    await retry
+
+    assert in_flight.json()["status"] == "pending"
+    done = await client.get(summary_url)
+    assert done.json()["status"] == "completed"
+    assert done.json()["summary"] == "A retried summary"
+
+
+async def test_fallback_scratch_pool_is_removed_at_exit(monkeypatch, tmp_path):
+    """A pool created without the lifespan is still cleaned up when the process exits."""
+    import atexit
+
+    from starlette.datastructures import State
+
+    from src.app import web
+
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setenv("SCRATCH_DIR", str(tmp_path))
+    request = SimpleNamespace(app=SimpleNamespace(state=State()))
+
+    pool = web.get_scratch_pool(request)
+
+    assert web.get_scratch_pool(request) is pool
+    assert registered == [pool.close]
+    registered[0]()
+    assert not pool.root.exists()
+
+
+async def test_transcription_progress_is_served(client):
+    """Per-chunk progress recorded during transcription is readable over the API."""
+    from src.app.web import record_progress
+
+    record_progress("progress-hash", "transcribe", 2, 5)
+    response = await client.get("/progress/progress-hash")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "content_hash": "progress-hash",
+        "stage": "transcribe",
+        "completed": 2,
+        "total": 5
+    }
+    assert (await client.get("/progress/unknown-hash")).status_code == 404
+
+
+async def test_download_report_unknown_hash(client):
+    """Reports are only served for videos that have been processed."""
+    response = await client.get("/download/0123abcd/report.md")
+    assert response.status_code == 404
+
+
+async def test_summary_unknown_hash(client):
+    """Summaries are only tracked for videos that have been processed."""
+    response = await client.get("/summary/0123abcd")
+    assert response.status_code == 404
+
+
+async def test_upload_video_rejects_spoofed_content_type(client):
+    """A video content type does not get a non-video file past validation."""
+    files = {"file": ("clip.mp4", b"not really a video", "video/mp4")}
+    response = await client.post("/upload-video", files=files)
+    assert response.status_code == 400
+    assert "File must be a video format" in response.json()["detail"]
+
+
+async def test_video_upload_is_recognized_by_magic_bytes():
+    """Containers are recognized from their header whatever the client claims."""
+    import io
+
+    from fastapi import UploadFile
+    from src.app.web import is_video_upload
+
+    mp4_head = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 64
+    upload = UploadFile(io.BytesIO(mp4_head), filename="clip.bin")
+
+    assert await is_video_upload(upload)
+    assert await upload.read() == mp4_head
+
+
+async def test_mpeg_transport_streams_are_recognized():
+    """.ts and .m2ts uploads pass validation by their packet sync bytes."""
+    import io
+
+    from fastapi import UploadFile
+    from src.app.web import is_video_upload
+
+    ts_packet = b"\x47" + b"\x00" * 187
+    m2ts_packet = b"\x00" * 4 + ts_packet
+
+    assert await is_video_upload(UploadFile(io.BytesIO(ts_packet * 30), filename="clip.ts"))
+    assert await is_video_upload(UploadFile(io.BytesIO(m2ts_packet * 30), filename="clip.m2ts"))
+    # A stray 0x47 at the start is not enough
+    assert not await is_video_upload(UploadFile(io.BytesIO(b"G" + b"\x00" * 1000), filename="a.bin"))
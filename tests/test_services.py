@@ -0,0 +1,784 @@
+"""Tests for the service layer."""
+
+import asyncio
+import json
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.app.services.summarization import SummarizationService
+from src.app.services.video_processor import VideoProcessor
+
+
+def write_test_audio(path, sample_rate=44100):
+    """Write a stereo WAV of 2s tone, 2s silence, 2s tone."""
+    t = np.arange(sample_rate * 2) / sample_rate
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+    silence = np.zeros(sample_rate * 2, dtype=np.int16)
+    samples = np.concatenate([tone, silence, tone])
+    with wave.open(str(path), "wb") as audio_file:
+        audio_file.setnchannels(2)
+        audio_file.setsampwidth(2)
+        audio_file.setframerate(sample_rate)
+        audio_file.writeframes(np.repeat(samples, 2).tobytes())
+    return path
+
+
+class FakeCompletions:
+    """Stand-in for client.chat.completions that echoes a canned reply."""
+
+    def __init__(self, reply: str = "1. First point\n2. Second point", delay: float = 0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        message = SimpleNamespace(content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeEmbeddings:
+    """Stand-in for client.embeddings; inputs starting with "x" get their own vector."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(data=[
+            SimpleNamespace(embedding=[0.0, 1.0, 0.0] if text.startswith("x") else [1.0, 0.0, 0.0])
+            for text in kwargs["input"]
+        ])
+
+
+@pytest.fixture
+def summarization_service(monkeypatch):
+    """SummarizationService wired to a fake chat completions client."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    service = SummarizationService()
+    completions = FakeCompletions()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service
+
+
+async def test_generate_full_report_runs_concurrently(summarization_service):
+    """The three report prompts are issued in parallel, not back to back."""
+    completions = summarization_service.client.chat.completions
+    completions.delay = 0.2
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    report = await summarization_service.generate_full_report("Some transcript")
+    elapsed = loop.time() - started
+
+    assert len(completions.calls) == 3
+    # Back to back would take at least 0.6s
+    assert elapsed < 0.45
+    assert report["key_points"] == ["First point", "Second point"]
+    assert report["action_items"] == ["First point", "Second point"]
+
+
+@pytest.fixture
+def batching_summarization_service(monkeypatch):
+    """SummarizationService with request batching enabled."""
+    monkeypatch.setenv("SUMMARY_MAX_BATCH_SIZE", "8")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    service = SummarizationService()
+    completions = FakeCompletions()
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service
+
+
+async def test_concurrent_summaries_share_one_request(batching_summarization_service):
+    """Summary requests arriving together are coalesced into a single call."""
+    service = batching_summarization_service
+    completions = service.client.chat.completions
+    completions.reply = '{"summaries": ["one", "two"]}'
+
+    summaries = await asyncio.gather(
+        service.generate_summary("first"),
+        service.generate_summary("second"),
+    )
+
+    assert summaries == ["one", "two"]
+    assert len(completions.calls) == 1
+    assert completions.calls[0]["response_format"] == {"type": "json_object"}
+    # Every summary in the batch keeps the reply budget of a single call
+    assert completions.calls[0]["max_tokens"] == 3000
+
+
+def test_summary_batch_size_follows_the_model_reply_limit(monkeypatch):
+    """Batches hold as many summaries as the model can return in one completion."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("SUMMARY_MAX_BATCH_SIZE", "8")
+
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    assert SummarizationService()._batcher.max_batch_size == 2
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o-mini")
+    assert SummarizationService()._batcher.max_batch_size == 8
+    monkeypatch.setenv("SUMMARY_COMPLETION_MAX_TOKENS", "6000")
+    assert SummarizationService()._batcher.max_batch_size == 4
+
+
+async def test_summary_batching_is_off_by_default(summarization_service):
+    """Without opting in, concurrent transcripts never share a prompt."""
+    completions = summarization_service.client.chat.completions
+    completions.reply = "A summary"
+
+    await asyncio.gather(
+        summarization_service.generate_summary("first"),
+        summarization_service.generate_summary("second"),
+    )
+
+    assert len(completions.calls) == 2
+    assert all("response_format" not in call for call in completions.calls)
+
+
+async def test_batcher_does_not_hold_requests_behind_a_call_in_flight():
+    """A request arriving mid-call is dispatched without waiting for that call."""
+    from src.app.services.batching import AsyncBatchSummarizer
+
+    async def summarize_one(transcript, summary_type):
+        await asyncio.sleep(0.3)
+        return transcript.upper()
+
+    async def summarize_many(transcripts, summary_type):
+        await asyncio.sleep(0.3)
+        return [transcript.upper() for transcript in transcripts]
+
+    batcher = AsyncBatchSummarizer(summarize_one, summarize_many, batch_wait_timeout_s=0.05)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def submit_after(delay, transcript):
+        await asyncio.sleep(delay)
+        result = await batcher.submit(transcript, "brief")
+        return result, loop.time() - started
+
+    (first, first_done), (second, second_done) = await asyncio.gather(
+        submit_after(0, "first"), submit_after(0.1, "second")
+    )
+
+    assert (first, second) == ("FIRST", "SECOND")
+    # A lone request is sent at once; queued behind the first call it would end at 0.6s
+    assert first_done < 0.35
+    assert second_done < 0.55
+
+
+async def test_batcher_caps_batches_by_tokens():
+    """Transcripts that would overflow the token budget go in separate calls."""
+    from src.app.services.batching import AsyncBatchSummarizer
+
+    batches = []
+
+    async def summarize_one(transcript, summary_type):
+        batches.append([transcript])
+        return transcript
+
+    async def summarize_many(transcripts, summary_type):
+        batches.append(transcripts)
+        return transcripts
+
+    batcher = AsyncBatchSummarizer(
+        summarize_one,
+        summarize_many,
+        max_batch_tokens=10,
+        count_tokens=len
+    )
+
+    async def submit_all():
+        return await asyncio.gather(*(
+            batcher.submit(transcript, "brief")
+            for transcript in ("aaaa", "bbbb", "cccccccc", "dd")
+        ))
+
+    assert await submit_all() == ["aaaa", "bbbb", "cccccccc", "dd"]
+    assert batches == [["aaaa", "bbbb"], ["cccccccc", "dd"]]
+
+
+async def test_batcher_close_fails_waiting_requests():
+    """Closing the batcher answers pending callers instead of leaving them hanging."""
+    from src.app.services.batching import AsyncBatchSummarizer
+
+    async def summarize_one(transcript, summary_type):
+        await asyncio.sleep(10)
+
+    async def summarize_many(transcripts, summary_type):
+        await asyncio.sleep(10)
+
+    batcher = AsyncBatchSummarizer(summarize_one, summarize_many)
+    pending = asyncio.gather(
+        batcher.submit("first", "brief"),
+        batcher.submit("second", "brief"),
+        return_exceptions=True
+    )
+    await asyncio.sleep(0.01)
+    await batcher.close()
+
+    results = await asyncio.wait_for(pending, 1)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher._worker is None
+
+
+async def test_batcher_keeps_running_after_a_failed_batch():
+    """An error while dispatching fails that batch's callers, not the worker."""
+    from src.app.services.batching import AsyncBatchSummarizer
+
+    async def summarize_one(transcript, summary_type):
+        return transcript.upper()
+
+    async def summarize_many(transcripts, summary_type):
+        return [transcript.upper() for transcript in transcripts]
+
+    def count_tokens(transcript):
+        if transcript == "broken":
+            raise ValueError("cannot tokenize")
+        return 1
+
+    batcher = AsyncBatchSummarizer(
+        summarize_one, summarize_many, max_batch_tokens=10, count_tokens=count_tokens
+    )
+
+    with pytest.raises(ValueError):
+        await batcher.submit("broken", "brief")
+    assert await batcher.submit("fine", "brief") == "FINE"
+    await batcher.close()
+
+
+async def test_malformed_batch_falls_back_to_single_requests(batching_summarization_service):
+    """A batched reply that is not valid JSON is retried per transcript."""
+    summarization_service = batching_summarization_service
+    completions = summarization_service.client.chat.completions
+    completions.reply = "Not JSON at all"
+
+    summaries = await asyncio.gather(
+        summarization_service.generate_summary("first"),
+        summarization_service.generate_summary("second"),
+    )
+
+    assert summaries == ["Not JSON at all", "Not JSON at all"]
+    assert len(completions.calls) == 3
+
+
+async def test_repeated_summary_is_served_from_cache(summarization_service):
+    """An identical transcript does not trigger a second completion."""
+    completions = summarization_service.client.chat.completions
+    completions.reply = "A summary"
+
+    first = await summarization_service.generate_summary("Same transcript")
+    second = await summarization_service.generate_summary("Same transcript")
+
+    assert first == second == "A summary"
+    assert len(completions.calls) == 1
+
+
+async def test_similar_transcript_hits_semantic_cache(summarization_service):
+    """A transcript with a near-identical embedding reuses the cached summary."""
+    completions = summarization_service.client.chat.completions
+    completions.reply = "A summary"
+    embeddings = FakeEmbeddings()
+    summarization_service.client.embeddings = embeddings
+
+    await summarization_service.generate_summary("Original transcript")
+    summary = await summarization_service.generate_summary("Original transcript!")
+
+    assert summary == "A summary"
+    assert len(completions.calls) == 1
+    assert len(embeddings.calls) == 2
+
+
+async def test_transcripts_differing_after_first_window_miss_semantic_cache(
+    summarization_service, monkeypatch
+):
+    """The whole transcript is embedded, not just its opening window."""
+    from src.app.services import summarization
+
+    monkeypatch.setattr(summarization, "EMBEDDING_MAX_CHARS", 10)
+    completions = summarization_service.client.chat.completions
+    completions.reply = "A summary"
+    summarization_service.client.embeddings = FakeEmbeddings()
+
+    await summarization_service.generate_summary("Shared opening, ending one")
+    await summarization_service.generate_summary("Shared opening, ending two")
+    await summarization_service.generate_summary("Shared opexx, ending 3")
+
+    # The second transcript matches every window; the third differs in one
+    assert len(completions.calls) == 2
+
+
+async def test_submit_batch_reports_the_created_batch_status(summarization_service):
+    """The status returned on submission is the batch's own, not a guess."""
+    requests = []
+
+    async def create_file(file, purpose):
+        requests.extend(json.loads(line) for line in file[1].read().splitlines())
+        return SimpleNamespace(id="file-1")
+
+    async def create_batch(**kwargs):
+        return SimpleNamespace(id="batch-1", status="in_progress")
+
+    summarization_service.client.files = SimpleNamespace(create=create_file)
+    summarization_service.client.batches = SimpleNamespace(create=create_batch)
+
+    batch = await summarization_service.submit_batch({"video-1": "A transcript"})
+
+    assert batch == {"id": "batch-1", "status": "in_progress"}
+    assert [request["custom_id"] for request in requests] == ["video-1"]
+
+
+async def test_batch_results_include_failed_requests(summarization_service):
+    """Requests in the batch's error file are reported under errors."""
+    def completion(custom_id, content):
+        body = {"choices": [{"message": {"content": content}}]}
+        return {"custom_id": custom_id, "response": {"status_code": 200, "body": body}}
+
+    files = {
+        "file-out": [completion("video-1", " First summary ")],
+        "file-err": [
+            {"custom_id": "video-2", "response": {"status_code": 400, "body": {"error": "too long"}}},
+            {"custom_id": "video-3", "error": {"code": "server_error"}},
+        ],
+    }
+
+    async def retrieve(batch_id):
+        return SimpleNamespace(
+            id=batch_id, status="completed", output_file_id="file-out", error_file_id="file-err"
+        )
+
+    async def content(file_id):
+        return SimpleNamespace(text="\n".join(json.dumps(item) for item in files[file_id]))
+
+    summarization_service.client.batches = SimpleNamespace(retrieve=retrieve)
+    summarization_service.client.files = SimpleNamespace(content=content)
+
+    result = await summarization_service.get_batch_results("batch-1")
+
+    assert result["summaries"] == {"video-1": "First summary"}
+    assert result["errors"] == {
+        "video-2": {"error": "too long"},
+        "video-3": {"code": "server_error"},
+    }
+
+    # With every request failed there is no output file at all
+    files["file-out"] = []
+
+    async def retrieve_all_failed(batch_id):
+        return SimpleNamespace(
+            id=batch_id, status="completed", output_file_id=None, error_file_id="file-err"
+        )
+
+    summarization_service.client.batches = SimpleNamespace(retrieve=retrieve_all_failed)
+    result = await summarization_service.get_batch_results("batch-2")
+
+    assert result["summaries"] == {}
+    assert set(result["errors"]) == {"video-2", "video-3"}
+
+
+async def test_special_token_text_in_transcripts_is_tokenized(summarization_service):
+    """Text like <|endoftext|> in a transcript is counted as ordinary text."""
+    class FakeEncoding:
+        """Mimics tiktoken, which rejects special-token text unless allowed."""
+
+        def encode(self, text, disallowed_special="all"):
+            if disallowed_special == "all" and "<|endoftext|>" in text:
+                raise ValueError("disallowed special token")
+            return text.split()
+
+        def decode(self, tokens):
+            return " ".join(tokens)
+
+    summarization_service._encoding = FakeEncoding()
+    summarization_service._encoding_loaded = True
+    summarization_service.client.chat.completions.reply = "A summary"
+
+    transcript = "The speaker typed <|endoftext|> into the chat"
+    assert summarization_service._count_tokens(transcript) == 7
+    assert await summarization_service.generate_summary(transcript) == "A summary"
+
+
+async def test_long_transcript_is_summarized_by_map_reduce(summarization_service):
+    """Transcripts over the chunk size get one call per chunk plus a reduce call."""
+    completions = summarization_service.client.chat.completions
+    completions.reply = "Partial summary"
+    summarization_service.chunk_tokens = 50
+    summarization_service.chunk_overlap_tokens = 10
+
+    transcript = " ".join(f"word{i}" for i in range(200))
+    chunks = summarization_service._chunk_transcript(transcript)
+    summary = await summarization_service.generate_summary(transcript)
+
+    assert len(chunks) > 1
+    assert summary == "Partial summary"
+    assert len(completions.calls) == len(chunks) + 1
+    assert "Part 1:" in completions.calls[-1]["messages"][1]["content"]
+
+
+async def test_key_points_parsed_from_json_reply(summarization_service):
+    """Key points come back as a JSON object in JSON mode."""
+    completions = summarization_service.client.chat.completions
+    completions.reply = '{"items": ["Alpha", "Beta"]}'
+
+    key_points = await summarization_service.generate_key_points("Some transcript")
+
+    assert key_points == ["Alpha", "Beta"]
+    assert completions.calls[0]["response_format"] == {"type": "json_object"}
+
+
+def test_parse_list_falls_back_to_bullets(summarization_service):
+    """Replies that are not JSON are parsed as a numbered or bulleted list."""
+    content = "Intro line\n1) One\n- Two\n• Three  \n"
+
+    assert summarization_service._parse_list(content) == ["One", "Two", "Three"]
+    assert summarization_service._parse_list("Just prose") == ["Just prose"]
+
+
+async def test_silence_removal_in_process(tmp_path):
+    """Audio is resampled to 16 kHz mono and the silent gap is cut out."""
+    pytest.importorskip("av")
+    video_path = write_test_audio(tmp_path / "clip.wav")
+
+    audio_path = await VideoProcessor().extract_audio_with_silence_removal(video_path)
+
+    with wave.open(str(audio_path), "rb") as audio_file:
+        assert audio_file.getnchannels() == 1
+        assert audio_file.getframerate() == 16000
+        duration = audio_file.getnframes() / 16000
+    # 4s of tone; silenceremove keeps a little silence around the gap
+    assert 4.0 < duration < 5.0
+
+
+async def test_segment_silence_removal_in_process(monkeypatch, tmp_path):
+    """The detect-and-trim mode cuts the gap down to the configured padding."""
+    pytest.importorskip("av")
+    monkeypatch.setenv("SILENCE_REMOVAL_MODE", "segments")
+    video_path = write_test_audio(tmp_path / "clip.wav")
+
+    audio_path = await VideoProcessor().extract_audio_with_silence_removal(video_path)
+
+    with wave.open(str(audio_path), "rb") as audio_file:
+        duration = audio_file.getnframes() / 16000
+    # 4s of tone plus 0.2s padding on each side of the gap
+    assert duration == pytest.approx(4.4, abs=0.05)
+
+
+async def test_probe_results_are_cached_by_file_identity(tmp_path):
+    """A cached probe is reused until the file changes on disk."""
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"first version")
+    processor = VideoProcessor()
+    processor._store_probe(processor._probe_key(video_path, "duration"), 12.5)
+
+    assert await processor._get_audio_duration(video_path) == 12.5
+
+    video_path.write_bytes(b"second, longer version")
+    assert processor._probe_key(video_path, "duration") not in processor._probe_cache
+
+
+def test_parse_silence_output_pairs_events():
+    """silencedetect stderr is parsed into (start, end) silence ranges."""
+    stderr = (
+        b"size=N/A time=00:00:01.00\n"
+        b"[silencedetect @ 0x1] silence_start: 1.5\n"
+        b"[silencedetect @ 0x1] silence_end: 3.25 | silence_duration: 1.75\n"
+        b"[silencedetect @ 0x1] silence_end: 4 | silence_duration: 0.5\n"
+        b"[silencedetect @ 0x1] silence_start: -0.01\n"
+        b"[silencedetect @ 0x1] silence_end: 0.75 | silence_duration: 0.76\n"
+    )
+
+    segments = VideoProcessor()._parse_silence_output(stderr)
+
+    assert segments == [(1.5, 3.25), (-0.01, 0.75)]
+
+
+def test_speech_segments_are_gaps_between_silences():
+    """Overlapping and unsorted silences still produce the speech gaps."""
+    processor = VideoProcessor()
+    silences = [(5.0, 6.0), (0.0, 1.0), (2.0, 3.5), (3.0, 4.0)]
+
+    assert processor._get_speech_segments(silences, 8.0) == [
+        (1.0, 2.0), (4.0, 5.0), (6.0, 8.0)
+    ]
+    assert processor._get_speech_segments([(0.0, 8.0)], 8.0) == []
+    assert processor._get_speech_segments([], 8.0) == [(0.0, 8.0)]
+
+
+class FakeWhisperModel:
+    """Stand-in for faster_whisper.WhisperModel with a fixed two-segment reply."""
+
+    def __init__(self, model_size, device, compute_type, num_workers):
+        self.options = (model_size, device, compute_type, num_workers)
+
+    def transcribe(self, audio, word_timestamps, vad_filter):
+        assert vad_filter
+        assert isinstance(audio, str) or audio.dtype == np.float32
+        segments = [
+            SimpleNamespace(start=0.0, end=1.0, text=" Hello", words=None),
+            SimpleNamespace(start=1.0, end=2.0, text=" world.", words=None),
+        ]
+        return iter(segments), SimpleNamespace(language="en", duration=2.0)
+
+
+@pytest.fixture
+def local_transcription_service(monkeypatch):
+    """TranscriptionService using WHISPER_BACKEND=local with a fake model."""
+    import sys
+
+    from src.app.services.transcription import TranscriptionService
+
+    monkeypatch.setitem(sys.modules, "faster_whisper", SimpleNamespace(WhisperModel=FakeWhisperModel))
+    monkeypatch.setenv("WHISPER_BACKEND", "local")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    return TranscriptionService()
+
+
+async def test_local_whisper_backend(local_transcription_service, tmp_path):
+    """WHISPER_BACKEND=local transcribes with faster-whisper, no API key needed."""
+    audio_path = tmp_path / "audio.wav"
+    audio_path.write_bytes(b"")
+
+    assert local_transcription_service.removes_silence
+    assert await local_transcription_service.transcribe_audio(audio_path) == "Hello world."
+    samples = np.zeros(16000, dtype=np.int16)
+    assert await local_transcription_service.transcribe_audio(samples) == "Hello world."
+
+
+async def test_local_model_is_loaded_by_warm_up(local_transcription_service):
+    """Warming up loads the model so the first request doesn't have to."""
+    backend = local_transcription_service.local_backend
+    assert backend._model is None
+
+    await local_transcription_service.warm_up()
+
+    assert isinstance(backend._model, FakeWhisperModel)
+
+
+async def test_concurrent_local_transcriptions_run_in_parallel(monkeypatch, tmp_path):
+    """Concurrent requests reach the model from separate threads at the same time."""
+    import threading
+    import time
+
+    from src.app.services.transcription import TranscriptionService, WhisperLocalBackend
+
+    monkeypatch.setenv("WHISPER_NUM_WORKERS", "3")
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def transcribe(self, audio, word_timestamps=False):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return {"text": "Hello world."}
+
+    monkeypatch.setattr(WhisperLocalBackend, "transcribe", transcribe)
+    monkeypatch.setenv("WHISPER_BACKEND", "local")
+    service = TranscriptionService()
+    audio_paths = [tmp_path / f"audio{i}.wav" for i in range(3)]
+    for audio_path in audio_paths:
+        audio_path.write_bytes(b"")
+
+    transcripts = await asyncio.gather(*(
+        service.transcribe_audio(audio_path) for audio_path in audio_paths
+    ))
+
+    assert transcripts == ["Hello world."] * 3
+    assert service.local_backend.num_workers == 3
+    assert peak == 3
+
+
+async def test_silence_events_are_read_from_stream():
+    """Only silencedetect lines are kept while streaming ffmpeg's stderr."""
+    stream = asyncio.StreamReader()
+    stream.feed_data(b"Input #0, wav, from 'clip.wav':\n")
+    stream.feed_data(b"[silencedetect @ 0x1] silence_start: 2\n")
+    stream.feed_data(b"[silencedetect @ 0x1] silence_end: 4 | silence_duration: 2\n")
+    stream.feed_eof()
+    processor = VideoProcessor()
+
+    events = await processor._read_silence_events(stream)
+
+    assert processor._parse_silence_output(events) == [(2.0, 4.0)]
+
+
+async def test_extract_audio_samples_maps_wav(tmp_path):
+    """Extracted samples are exposed as an int16 array over the WAV file."""
+    pytest.importorskip("av")
+    video_path = write_test_audio(tmp_path / "clip.wav")
+
+    samples = await VideoProcessor().extract_audio_samples(video_path)
+
+    assert samples.dtype == np.int16
+    assert len(samples) == pytest.approx(6 * 16000, abs=16)
+    assert not samples.flags.writeable
+
+
+async def test_detect_silence_on_wav_runs_in_process(tmp_path):
+    """Silence in extracted 16 kHz mono audio is found without ffmpeg."""
+    pytest.importorskip("av")
+    processor = VideoProcessor()
+    audio_path = await processor.extract_audio(write_test_audio(tmp_path / "clip.wav"))
+
+    segments = await processor.detect_silence(audio_path)
+
+    assert len(segments) == 1
+    start, end = segments[0]
+    assert start == pytest.approx(2.0, abs=0.05)
+    assert end == pytest.approx(4.0, abs=0.05)
+
+
+async def test_result_cache_keeps_hot_entries_in_front_of_redis():
+    """Results are gzipped into Redis and served from the local LRU when hot."""
+    import gzip
+
+    from src.app.services.cache import ResultCache
+
+    class FakeRedis:
+        def __init__(self):
+            self.data = {}
+            self.gets = 0
+
+        async def get(self, key):
+            self.gets += 1
+            return self.data.get(key)
+
+        async def set(self, key, value, ex=None):
+            self.data[key] = value
+
+    cache = ResultCache(max_entries=1)
+    cache._redis = FakeRedis()
+
+    await cache.set("transcript:a", "first transcript")
+    await cache.set("transcript:b", "second transcript")
+
+    assert gzip.decompress(cache._redis.data["transcript:a"]) == b"first transcript"
+    assert await cache.get("transcript:b") == "second transcript"
+    assert cache._redis.gets == 0
+    # Evicted locally, refilled from Redis
+    assert await cache.get("transcript:a") == "first transcript"
+    assert cache._redis.gets == 1
+    assert await cache.get("transcript:missing") is None
+
+
+def test_transcription_chunks_end_on_pauses():
+    """Chunks are cut at the latest pause that keeps them under the limit."""
+    processor = VideoProcessor()
+    processor.transcribe_chunk_s = 10.0
+    pauses = [(4.0, 4.4), (8.0, 8.4), (15.0, 15.2)]
+
+    assert processor._plan_chunks(pauses, 25.0) == [(0.0, 8.2), (8.2, 15.1), (15.1, 25.0)]
+    assert processor._plan_chunks([], 25.0) == [(0.0, 10.0), (10.0, 20.0), (20.0, 25.0)]
+
+
+async def test_chunks_are_transcribed_in_parallel_and_kept_in_order(monkeypatch, tmp_path):
+    """Chunk transcripts are joined in playback order, not completion order."""
+    from src.app.services.transcription import TranscriptionService
+
+    class FakeTranscriptions:
+        def __init__(self):
+            self.active = 0
+            self.peak = 0
+
+        async def create(self, model, file, response_format):
+            name, _ = file
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            # Later chunks finish first
+            await asyncio.sleep(0.05 / int(name[5]))
+            self.active -= 1
+            return f"text of {name}\n"
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("WHISPER_BACKEND", "openai")
+    service = TranscriptionService()
+    transcriptions = FakeTranscriptions()
+    service.client = SimpleNamespace(audio=SimpleNamespace(transcriptions=transcriptions))
+    chunk_paths = [tmp_path / f"chunk{i}.wav" for i in range(1, 4)]
+    for chunk_path in chunk_paths:
+        chunk_path.write_bytes(b"")
+    progress = []
+
+    transcript = await service.transcribe_chunks(chunk_paths, lambda done, total: progress.append(done))
+
+    assert transcript == "text of chunk1.wav text of chunk2.wav text of chunk3.wav"
+    assert transcriptions.peak == 3
+    assert progress == [1, 2, 3]
+
+
+async def test_metadata_is_probed_in_process(monkeypatch, tmp_path):
+    """Video info and audio durations are read without spawning ffprobe."""
+    pytest.importorskip("av")
+
+    async def no_subprocess(*args, **kwargs):
+        raise AssertionError("ffprobe should not be spawned")
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", no_subprocess)
+    video_path = write_test_audio(tmp_path / "clip.wav")
+    processor = VideoProcessor()
+
+    info = await processor.get_video_info(video_path)
+
+    assert info["duration"] == pytest.approx(6.0)
+    assert info["audio"] == {"codec": "pcm_s16le", "sample_rate": 44100, "channels": 2}
+    assert info["video"]["codec"] == ""
+    assert await processor._get_audio_duration(video_path) == pytest.approx(6.0)
+
+
+async def test_extract_audio_pcm_stays_in_memory(tmp_path):
+    """Audio decoded for in-memory transcription never touches the disk."""
+    pytest.importorskip("av")
+    video_path = write_test_audio(tmp_path / "clip.wav")
+
+    samples = await VideoProcessor().extract_audio_pcm(video_path)
+
+    assert samples.dtype == np.int16
+    assert len(samples) == pytest.approx(6 * 16000, abs=16)
+    assert list(tmp_path.iterdir()) == [video_path]
+
+
+async def test_scratch_pool_reuses_emptied_slots(tmp_path):
+    """Leased slots are emptied on return and leases wait while all are in use."""
+    from src.app.services.scratch import ScratchPool
+
+    pool = ScratchPool(tmp_path / "scratch", size=1)
+
+    async with pool.lease() as slot:
+        (slot / "input_clip.mp4").write_bytes(b"video")
+        (slot / "chunks").mkdir()
+        (slot / "chunks" / "chunk_0.wav").write_bytes(b"audio")
+        # The only slot is taken, so a second lease has to wait
+        waiting = asyncio.create_task(pool.lease().__aenter__())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+    assert await waiting == slot
+    assert slot.is_dir()
+    assert list(slot.iterdir()) == []
+
+    pool.close()
+    assert not pool.root.exists()
+
+
+def test_scratch_pool_only_allocates_slots_that_fit(monkeypatch, tmp_path):
+    """SCRATCH_SLOTS is lowered when the scratch dir can't hold that many uploads."""
+    import shutil
+
+    from src.app.services.scratch import ScratchPool
+
+    monkeypatch.setenv("SCRATCH_DIR", str(tmp_path))
+    monkeypatch.setenv("SCRATCH_SLOTS", "4")
+    free = shutil.disk_usage(tmp_path).free
+
+    pool = ScratchPool.from_env(slot_bytes=free // 2)
+    try:
+        assert pool.size == 2
+        assert pool.root.parent == tmp_path
+    finally:
+        pool.close()